@@ -1,9 +1,21 @@
 # core/backends.py
+from functools import lru_cache
+
 from django.contrib.auth.backends import ModelBackend
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import check_password, make_password
+from django.db.models import Case, Q, When
+from django.utils.crypto import get_random_string
 
 User = get_user_model()
 
+
+@lru_cache(maxsize=1)
+def _dummy_password_hash():
+    """Real hash checked when no user matches, so misses cost as much as hits"""
+    return make_password(get_random_string(32))
+
+
 class EmailOrUsernameBackend(ModelBackend):
     """
     Authenticate using either username or email.
@@ -12,13 +24,19 @@ class EmailOrUsernameBackend(ModelBackend):
         if username is None or password is None:
             return None
 
-        try:
-            user = User.objects.get(username=username)
-        except User.DoesNotExist:
-            try:
-                user = User.objects.get(email=username)
-            except User.DoesNotExist:
-                return None
+        # One query for both identifiers, joining the organization up front
+        # since the login response serializes it. Both are matched exactly,
+        # as before. A username match wins over an email match, so it is
+        # ordered first; several users may share the email, in which case
+        # the oldest account is checked.
+        user = User.objects.select_related('organization').filter(
+            Q(username=username) | Q(email=username)
+        ).order_by(Case(When(username=username, then=0), default=1), 'pk').first()
+
+        if user is None:
+            # Hash anyway to keep response time from revealing unknown users
+            check_password(password, _dummy_password_hash())
+            return None
 
         if user.check_password(password) and self.user_can_authenticate(user):
             return user
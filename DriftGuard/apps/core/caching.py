@@ -0,0 +1,93 @@
+"""
+Conditional GET support for organization-scoped list endpoints
+
+Each organization has a list version in the cache that changes whenever
+data rendered by those lists changes (see apps.core.signals). List
+responses carry an ETag derived from it, so a client repeating a request
+with If-None-Match gets 304 Not Modified without any database or
+serializer work.
+
+The cache is an optimization only: if it cannot be reached, writes still
+succeed and lists are served in full without an ETag.
+"""
+
+import hashlib
+import logging
+import time
+from typing import Optional
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+
+from .middleware import get_auth_context
+
+logger = logging.getLogger(__name__)
+
+
+def _version_key(organization_id) -> str:
+    return f'list-version:org:{organization_id}'
+
+
+def get_list_version(organization_id) -> Optional[int]:
+    """Current list version for an organization, None if the cache is unavailable"""
+    # Versions are timestamps rather than counters, so a version evicted
+    # from the cache never comes back with a value a client has seen
+    try:
+        return cache.get_or_set(_version_key(organization_id), time.time_ns, timeout=None)
+    except Exception as e:
+        logger.warning(f"Failed to read list version for organization {organization_id}: {str(e)}")
+        return None
+
+
+def bump_list_version(organization_id) -> None:
+    """Invalidate an organization's list ETags once the current transaction commits"""
+    if organization_id is None:
+        return
+    # robust: a failing callback must not turn a committed write into an error
+    transaction.on_commit(lambda: _set_list_version(organization_id), robust=True)
+
+
+def _set_list_version(organization_id) -> None:
+    try:
+        cache.set(_version_key(organization_id), time.time_ns(), timeout=None)
+    except Exception as e:
+        logger.warning(f"Failed to bump list version for organization {organization_id}: {str(e)}")
+
+
+class ConditionalListMixin:
+    """
+    ViewSet mixin answering list requests with ETags and 304 responses
+
+    Only JSON responses are tagged; the browsable API renders the
+    requesting user into the page.
+    """
+
+    def list(self, request, *args, **kwargs):
+        if request.accepted_renderer.format != 'json':
+            return super().list(request, *args, **kwargs)
+
+        etag = self.get_list_etag(request)
+        if etag is None:
+            return super().list(request, *args, **kwargs)
+
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = super().list(request, *args, **kwargs)
+
+        response['ETag'] = etag
+        # Responses are per organization, so only the client may reuse them
+        patch_cache_control(response, private=True, no_cache=True)
+        patch_vary_headers(response, ('Authorization', 'Cookie'))
+        return response
+
+    def get_list_etag(self, request) -> Optional[str]:
+        """ETag for the list, None if the list version is unavailable"""
+        organization_id = get_auth_context(request).organization_id
+        version = get_list_version(organization_id)
+        if version is None:
+            return None
+        digest = hashlib.md5(
+            f'{self.basename}|{organization_id}|{version}|{request.get_full_path()}'.encode()
+        ).hexdigest()
+        return f'W/"{digest}"'
@@ -0,0 +1,121 @@
+"""
+Custom model fields for DriftGuard
+"""
+
+import base64
+import hashlib
+import json
+import os
+from functools import lru_cache
+
+import orjson
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+class OrjsonEncoder(json.JSONEncoder):
+    """
+    JSON encoder backed by orjson
+
+    Django passes the encoder class to json.dumps, which only calls
+    encode(). Types orjson cannot handle natively (Decimal, lazy
+    translation strings, ...) fall back to DjangoJSONEncoder.
+    """
+
+    _fallback = DjangoJSONEncoder()
+
+    def encode(self, o):
+        return orjson.dumps(o, default=self._fallback.default, option=ORJSON_OPTIONS).decode()
+
+
+class OrjsonDecoder(json.JSONDecoder):
+    """
+    JSON decoder backed by orjson
+
+    orjson has no equivalent of the json.JSONDecoder hooks (object_hook,
+    parse_float, ...), so a decoder constructed with any of them parses
+    with the standard library instead of silently ignoring them.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._use_orjson = not (args or kwargs)
+
+    def decode(self, s, *args, **kwargs):
+        if not self._use_orjson:
+            return super().decode(s, *args, **kwargs)
+        return orjson.loads(s)
+
+
+class OrjsonJSONField(models.JSONField):
+    """JSONField that serializes and parses values with orjson"""
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault('encoder', OrjsonEncoder)
+        kwargs.setdefault('decoder', OrjsonDecoder)
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        if kwargs.get('encoder') is OrjsonEncoder:
+            del kwargs['encoder']
+        if kwargs.get('decoder') is OrjsonDecoder:
+            del kwargs['decoder']
+        return name, path, args, kwargs
+
+
+# Marks stored ciphertext, so rows written before encryption was enabled
+# are still read back as plaintext
+ENCRYPTED_PREFIX = 'enc:v1:'
+NONCE_SIZE = 12
+
+
+@lru_cache(maxsize=None)
+def _cipher(key: str) -> AESGCM:
+    # Any configured string becomes a 256-bit key
+    return AESGCM(hashlib.sha256(key.encode()).digest())
+
+
+def encrypt_value(value):
+    """
+    Encrypt a string with AES-256-GCM using CREDENTIALS_ENCRYPTION_KEY
+
+    The value is always treated as plaintext, even if it starts with
+    ENCRYPTED_PREFIX: EncryptedTextField decrypts on load, so it never holds
+    ciphertext.
+    """
+    if not value:
+        return value
+    nonce = os.urandom(NONCE_SIZE)
+    ciphertext = _cipher(settings.CREDENTIALS_ENCRYPTION_KEY).encrypt(nonce, value.encode(), None)
+    return ENCRYPTED_PREFIX + base64.b64encode(nonce + ciphertext).decode()
+
+
+def decrypt_value(value):
+    """Decrypt a value produced by encrypt_value; other values pass through"""
+    if not value or not value.startswith(ENCRYPTED_PREFIX):
+        return value
+    data = base64.b64decode(value[len(ENCRYPTED_PREFIX):])
+    plaintext = _cipher(settings.CREDENTIALS_ENCRYPTION_KEY).decrypt(data[:NONCE_SIZE], data[NONCE_SIZE:], None)
+    return plaintext.decode()
+
+
+class EncryptedTextField(models.TextField):
+    """
+    TextField stored encrypted with AES-256-GCM
+
+    Values are encrypted on save and decrypted when loaded, so model code
+    sees plaintext. Ciphertext uses a random nonce, so the field cannot be
+    filtered on. max_length only limits the plaintext accepted by forms
+    and serializers.
+    """
+
+    def from_db_value(self, value, expression, connection):
+        return decrypt_value(value)
+
+    def get_prep_value(self, value):
+        return encrypt_value(super().get_prep_value(value))
@@ -0,0 +1,25 @@
+"""
+Filtering helpers for DriftGuard viewsets
+"""
+
+from django_filters.rest_framework import DjangoFilterBackend
+
+
+class SkipUnusedFiltersMixin:
+    """
+    ViewSet mixin that skips DjangoFilterBackend when the request carries
+    none of the view's filters (filterset_class's, else filterset_fields)
+
+    Unfiltered requests, the common case for list pages, then avoid
+    building a FilterSet and its form. Other filter backends still run.
+    """
+
+    def filter_queryset(self, queryset):
+        filterset_class = getattr(self, 'filterset_class', None)
+        filter_names = filterset_class.base_filters if filterset_class else self.filterset_fields
+        filtering = not set(filter_names).isdisjoint(self.request.query_params)
+        for backend in self.filter_backends:
+            if not filtering and issubclass(backend, DjangoFilterBackend):
+                continue
+            queryset = backend().filter_queryset(self.request, queryset, self)
+        return queryset
@@ -0,0 +1,23 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.core.partitioning import AUDIT_LOG_PENDING_TABLE, copy_pending_audit_log_rows
+
+
+class Command(BaseCommand):
+    help = (
+        f'Move audit log rows left in {AUDIT_LOG_PENDING_TABLE} by core migration 0003 '
+        f'into the audit log table in batches, then drop {AUDIT_LOG_PENDING_TABLE}'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.DRIFTGUARD_BULK_BATCH_SIZE,
+            help='Rows moved per transaction'
+        )
+
+    def handle(self, *args, **options):
+        moved = copy_pending_audit_log_rows(options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Moved {moved} audit log rows'))
@@ -1,5 +1,6 @@
 from django.core.management.base import BaseCommand
 from django.contrib.auth.hashers import make_password
+from django.db import transaction
 from apps.organizations.models import Organization
 from apps.core.models import User
 
@@ -8,43 +9,61 @@ class Command(BaseCommand):
     help = 'Initialize database with default organization and admin user'
 
     def handle(self, *args, **options):
-        # Create default organization
-        org, created = Organization.objects.get_or_create(
-            name='Default Organization',
-            defaults={'slug': 'default'}
-        )
-        if created:
-            self.stdout.write(self.style.SUCCESS(f'Created organization: {org.name}'))
-
-        # Create admin user
-        user, user_created = User.objects.get_or_create(
-            username='admin',
-            defaults={
-                'email': 'admin@driftguard.com',
-                'password': make_password('admin123'),
-                'organization': org,
-                'role': 'admin',
-                'first_name': 'Admin',
-                'last_name': 'User'
-            }
-        )
-        if user_created:
-            self.stdout.write(self.style.SUCCESS(f'Created admin user: {user.username}'))
-
-        # Create regular test user
-        test_user, test_created = User.objects.get_or_create(
-            username='user',
-            defaults={
-                'email': 'user@driftguard.com',
-                'password': make_password('user123'),
-                'organization': org,
-                'role': 'editor',
-                'first_name': 'Test',
-                'last_name': 'User'
-            }
-        )
-        if test_created:
-            self.stdout.write(self.style.SUCCESS(f'Created test user: {test_user.username}'))
+        with transaction.atomic():
+            # Create default organization
+            org, created = Organization.objects.get_or_create(
+                name='Default Organization',
+                defaults={'slug': 'default'}
+            )
+            if created:
+                self.stdout.write(self.style.SUCCESS(f'Created organization: {org.name}'))
+
+            # Single lookup for both default users; passwords are only hashed
+            # for users that still need to be created
+            existing = set(
+                User.objects.filter(username__in=['admin', 'user']).values_list('username', flat=True)
+            )
+
+            users_to_create = []
+
+            # Create admin user
+            if 'admin' not in existing:
+                users_to_create.append(User(
+                    username='admin',
+                    email='admin@driftguard.com',
+                    password=make_password('admin123'),
+                    organization=org,
+                    role='admin',
+                    first_name='Admin',
+                    last_name='User'
+                ))
+
+            # Create regular test user
+            if 'user' not in existing:
+                users_to_create.append(User(
+                    username='user',
+                    email='user@driftguard.com',
+                    password=make_password('user123'),
+                    organization=org,
+                    role='editor',
+                    first_name='Test',
+                    last_name='User'
+                ))
+
+            User.objects.bulk_create(users_to_create, ignore_conflicts=True)
+
+            # Rows skipped as conflicts (created concurrently) hold another
+            # password hash; each hash built above has its own random salt
+            inserted = set(User.objects.filter(
+                username__in=[user.username for user in users_to_create],
+                password__in=[user.password for user in users_to_create]
+            ).values_list('username', flat=True))
+
+        for user in users_to_create:
+            if user.username not in inserted:
+                continue
+            label = 'admin user' if user.role == 'admin' else 'test user'
+            self.stdout.write(self.style.SUCCESS(f'Created {label}: {user.username}'))
 
         self.stdout.write(self.style.SUCCESS('Database initialization complete!'))
         self.stdout.write(self.style.SUCCESS(''))
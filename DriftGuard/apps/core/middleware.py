@@ -0,0 +1,54 @@
+from typing import NamedTuple, Optional
+
+from django.utils.functional import SimpleLazyObject
+
+
+class AuthContext(NamedTuple):
+    """Role and organization of the requesting user, resolved once per request"""
+
+    role: Optional[str]
+    organization_id: Optional[int]
+    # Admin role or superuser
+    is_admin: bool = False
+
+
+ANONYMOUS_CONTEXT = AuthContext(role=None, organization_id=None)
+
+
+def build_auth_context(user) -> AuthContext:
+    if not user.is_authenticated:
+        return ANONYMOUS_CONTEXT
+    return AuthContext(
+        role=user.role,
+        organization_id=user.organization_id,
+        is_admin=user.role == 'admin' or user.is_superuser,
+    )
+
+
+def get_auth_context(request) -> AuthContext:
+    """
+    Return the auth context memoized by AuthContextMiddleware, building it
+    on the fly when the middleware is not installed (e.g. in tests)
+    """
+    context = getattr(request, 'auth_context', None)
+    if context is None:
+        context = build_auth_context(request.user)
+    return context
+
+
+class AuthContextMiddleware:
+    """
+    Attach a lazily built AuthContext to every request
+
+    DRF authenticates JWT requests inside the view, after middleware has
+    run, so the context is only resolved on first access (normally by a
+    permission class). By then DRF has set the authenticated user on the
+    underlying request.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.auth_context = SimpleLazyObject(lambda: build_auth_context(request.user))
+        return self.get_response(request)
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-15 17:40
+
+from django.db import migrations, models
+
+from apps.core.operations import AddIndexConcurrentlyIfPostgres
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('core', '0001_initial'),
+        ('organizations', '0001_initial'),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyIfPostgres(
+            model_name='auditlog',
+            index=models.Index(fields=['organization', 'resource_type', 'resource_id', '-timestamp'], include=('action', 'user'), name='audit_org_res_ts_idx'),
+        ),
+    ]
@@ -0,0 +1,150 @@
+"""
+Range partition core_auditlog by month on PostgreSQL
+
+This migration only swaps the table: the existing table is renamed to
+core_auditlog_pending and an empty partitioned core_auditlog takes its
+place, so the migration holds its lock for the DDL alone. Existing rows
+are not copied here. After migrating, move them across in batches with
+
+    python manage.py copy_audit_log_rows
+
+which drops core_auditlog_pending once it is empty. Until then
+entries written before the migration are not visible through AuditLog.
+Reversing the migration works the same way in the other direction.
+
+The primary key of the partitioned table is (id, "timestamp"), because
+PostgreSQL requires the partition key in every unique constraint. The
+migration state is left unchanged and the model still declares id as its
+only primary key: ids come from the identity sequence and stay unique in
+practice, but the database no longer enforces it. Schema changes to
+AuditLog on PostgreSQL have to be checked against the partitioned table by
+hand rather than relying on autodetected migrations.
+"""
+
+from datetime import datetime, timezone as dt_timezone
+
+from django.db import migrations
+
+from apps.core.partitioning import (
+    AUDIT_LOG_PARTITION_MONTHS_AHEAD,
+    AUDIT_LOG_PENDING_TABLE,
+    add_months,
+    create_default_partition,
+    create_monthly_partition,
+    is_partitioned,
+    month_start,
+)
+
+TABLE = 'core_auditlog'
+OLD_TABLE = AUDIT_LOG_PENDING_TABLE
+
+
+def _rebuild_auditlog(cursor, partitioned):
+    """
+    Recreate core_auditlog with the same columns, indexes and foreign keys,
+    either range partitioned by month on "timestamp" or as a plain table.
+    The rows stay behind in OLD_TABLE for copy_audit_log_rows to move.
+    """
+    cursor.execute('SELECT to_regclass(%s)', [OLD_TABLE])
+    if cursor.fetchone()[0] is not None:
+        raise RuntimeError(
+            f'{OLD_TABLE} still holds rows from an earlier rebuild; '
+            f'run "manage.py copy_audit_log_rows" first'
+        )
+
+    # Capture index and foreign key definitions while they still reference
+    # the original table name
+    cursor.execute(
+        'SELECT indexrelid::regclass::text, pg_get_indexdef(indexrelid) FROM pg_index '
+        'WHERE indrelid = %s::regclass AND NOT indisprimary',
+        [TABLE],
+    )
+    indexes = cursor.fetchall()
+    cursor.execute(
+        "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+        "WHERE conrelid = %s::regclass AND contype = 'f'",
+        [TABLE],
+    )
+    foreign_keys = cursor.fetchall()
+    cursor.execute(
+        "SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'p'",
+        [TABLE],
+    )
+    primary_key = cursor.fetchone()[0]
+
+    cursor.execute(f'ALTER TABLE {TABLE} RENAME TO {OLD_TABLE}')
+    cursor.execute(f'ALTER TABLE {OLD_TABLE} RENAME CONSTRAINT {primary_key} TO {OLD_TABLE}_pkey')
+    # The old table only holds rows waiting to be copied; its foreign keys
+    # would otherwise block deleting users and organizations meanwhile
+    for name, _ in foreign_keys:
+        cursor.execute(f'ALTER TABLE {OLD_TABLE} DROP CONSTRAINT {name}')
+    for name, _ in indexes:
+        cursor.execute(f'DROP INDEX {name}')
+
+    if partitioned:
+        # Primary keys of partitioned tables must include the partition key
+        cursor.execute(
+            f'CREATE TABLE {TABLE} (LIKE {OLD_TABLE} INCLUDING DEFAULTS INCLUDING IDENTITY) '
+            f'PARTITION BY RANGE ("timestamp")'
+        )
+        cursor.execute(f'ALTER TABLE {TABLE} ADD CONSTRAINT {primary_key} PRIMARY KEY (id, "timestamp")')
+
+        # One partition per month from the oldest row up to the months ahead
+        # kept by ensure_audit_log_partitions, plus a default catch-all
+        cursor.execute(f'SELECT MIN("timestamp") FROM {OLD_TABLE}')
+        oldest = cursor.fetchone()[0]
+        current = month_start(datetime.now(dt_timezone.utc))
+        start = month_start(oldest) if oldest else current
+        last = add_months(current, AUDIT_LOG_PARTITION_MONTHS_AHEAD)
+        while start <= last:
+            create_monthly_partition(cursor, TABLE, start)
+            start = add_months(start, 1)
+        create_default_partition(cursor, TABLE)
+    else:
+        cursor.execute(f'CREATE TABLE {TABLE} (LIKE {OLD_TABLE} INCLUDING DEFAULTS INCLUDING IDENTITY)')
+        cursor.execute(f'ALTER TABLE {TABLE} ADD CONSTRAINT {primary_key} PRIMARY KEY (id)')
+
+    # Indexes created on a partitioned parent cascade to every partition
+    for _, definition in indexes:
+        cursor.execute(definition)
+    for name, definition in foreign_keys:
+        cursor.execute(f'ALTER TABLE {TABLE} ADD CONSTRAINT {name} {definition}')
+
+    # New rows must not reuse the ids of the rows still to be copied
+    cursor.execute(
+        f"SELECT setval(pg_get_serial_sequence('{TABLE}', 'id'), "
+        f"COALESCE((SELECT MAX(id) FROM {OLD_TABLE}), 0) + 1, false)"
+    )
+
+
+def partition_auditlog(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        if not is_partitioned(cursor, TABLE):
+            _rebuild_auditlog(cursor, partitioned=True)
+
+
+def unpartition_auditlog(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        if is_partitioned(cursor, TABLE):
+            _rebuild_auditlog(cursor, partitioned=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_auditlog_org_resource_timestamp_index'),
+    ]
+
+    operations = [
+        # Database only: the composite (id, "timestamp") primary key is not
+        # reflected in the model state, see the module docstring
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunPython(partition_auditlog, unpartition_auditlog),
+            ],
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.18 on 2026-10-15 17:46
+
+import django.contrib.postgres.indexes
+import django.db.models.deletion
+from django.db import migrations, models
+
+from apps.core.operations import AddIndexIfPostgres
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_partition_auditlog_by_month'),
+        ('organizations', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuditLogArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('original_id', models.BigIntegerField()),
+                ('timestamp', models.DateTimeField()),
+                ('action', models.CharField(max_length=100)),
+                ('resource_type', models.CharField(max_length=50)),
+                ('resource_id', models.CharField(max_length=255)),
+                ('payload', models.BinaryField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['-timestamp'],
+            },
+        ),
+        # GIN indexes are PostgreSQL only. core_auditlog is partitioned there,
+        # which rules out CREATE INDEX CONCURRENTLY
+        AddIndexIfPostgres(
+            model_name='auditlog',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['new_values'], name='audit_newvals_gin', opclasses=['jsonb_path_ops']),
+        ),
+        AddIndexIfPostgres(
+            model_name='auditlog',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['old_values'], name='audit_oldvals_gin', opclasses=['jsonb_path_ops']),
+        ),
+        migrations.AddField(
+            model_name='auditlogarchive',
+            name='organization',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='organizations.organization'),
+        ),
+        migrations.AddIndex(
+            model_name='auditlogarchive',
+            index=models.Index(fields=['organization', '-timestamp'], name='core_auditl_organiz_10f801_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='auditlogarchive',
+            index=models.Index(fields=['resource_type', 'resource_id'], name='core_auditl_resourc_70a53b_idx'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-15 17:46
+
+import apps.core.fields
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_auditlog_json_gin_indexes_archive'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='auditlog',
+            name='new_values',
+            field=apps.core.fields.OrjsonJSONField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='auditlog',
+            name='old_values',
+            field=apps.core.fields.OrjsonJSONField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-15 17:50
+
+from django.db import migrations, models
+
+from apps.core.operations import AddIndexConcurrentlyIfPostgres, RemoveIndexConcurrentlyIfPostgres
+
+
+class Migration(migrations.Migration):
+
+    # CREATE/DROP INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('core', '0005_auditlog_orjson_fields'),
+        ('organizations', '0001_initial'),
+    ]
+
+    # Build the partial indexes before dropping the full ones so lookups
+    # are never left without an index
+    operations = [
+        AddIndexConcurrentlyIfPostgres(
+            model_name='usersession',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['user', '-last_activity'], name='usersess_active_idx'),
+        ),
+        AddIndexConcurrentlyIfPostgres(
+            model_name='usersession',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['expires_at'], name='usersess_exp_idx'),
+        ),
+        RemoveIndexConcurrentlyIfPostgres(
+            model_name='usersession',
+            name='core_userse_user_id_3fb840_idx',
+        ),
+        RemoveIndexConcurrentlyIfPostgres(
+            model_name='usersession',
+            name='core_userse_expires_c40d52_idx',
+        ),
+    ]
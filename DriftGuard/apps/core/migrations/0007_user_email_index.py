@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-15 17:50
+
+from django.db import migrations, models
+
+from apps.core.operations import AddIndexConcurrentlyIfPostgres
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('core', '0006_usersession_partial_indexes'),
+        ('organizations', '0001_initial'),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyIfPostgres(
+            model_name='user',
+            index=models.Index(fields=['email'], name='user_email_idx'),
+        ),
+    ]
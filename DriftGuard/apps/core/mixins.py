@@ -0,0 +1,22 @@
+class ListOmittedFieldsMixin:
+    """
+    ViewSet mixin serializing lists with list_serializer_class
+
+    Model fields rendered by serializer_class but not by the list serializer
+    are deferred for list requests, so the larger JSON columns stay in the
+    database.
+    """
+
+    list_serializer_class = None
+
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return self.list_serializer_class
+        return super().get_serializer_class()
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.action == 'list':
+            omitted = set(self.serializer_class.Meta.fields) - set(self.list_serializer_class.Meta.fields)
+            queryset = queryset.defer(*omitted)
+        return queryset
@@ -1,7 +1,10 @@
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 from django.contrib.auth.models import AbstractUser
 from django.utils import timezone
 
+from .fields import OrjsonJSONField
+
 
 class TimestampedModel(models.Model):
     """Base model with automatic timestamps"""
@@ -34,6 +37,12 @@ class User(AbstractUser):
 
     class Meta:
         unique_together = ['organization', 'username']
+        indexes = [
+            # Login looks users up by exact email as well as username
+            models.Index(fields=['email'], name='user_email_idx'),
+            # Member management checks for another admin in the organization
+            models.Index(fields=['organization', 'role'], name='user_org_role_idx'),
+        ]
 
     def __str__(self):
         return f"{self.username} ({self.organization.name})"
@@ -61,9 +70,19 @@ class UserSession(models.Model):
 
     class Meta:
         ordering = ['-last_activity']
+        # Partial indexes: only active sessions are looked up, and
+        # deactivate_expired_sessions keeps that set small
         indexes = [
-            models.Index(fields=['user', '-last_activity']),
-            models.Index(fields=['expires_at']),
+            models.Index(
+                fields=['user', '-last_activity'],
+                name='usersess_active_idx',
+                condition=models.Q(is_active=True),
+            ),
+            models.Index(
+                fields=['expires_at'],
+                name='usersess_exp_idx',
+                condition=models.Q(is_active=True),
+            ),
         ]
 
     def __str__(self):
@@ -71,7 +90,14 @@ class UserSession(models.Model):
 
 
 class AuditLog(models.Model):
-    """Comprehensive audit logging for compliance"""
+    """
+    Comprehensive audit logging for compliance
+
+    On PostgreSQL the table is range partitioned by month on timestamp
+    (see apps.core.partitioning), so filter by timestamp where possible to
+    let the planner prune partitions. Its primary key there is
+    (id, timestamp); see core migration 0003 before changing the schema.
+    """
 
     ACTION_CHOICES = [
         ('CREATE', 'Create'),
@@ -104,8 +130,8 @@ class AuditLog(models.Model):
     resource_type = models.CharField(max_length=50)  # e.g., 'drift', 'environment', 'user'
     resource_id = models.CharField(max_length=255)
 
-    old_values = models.JSONField(null=True, blank=True)
-    new_values = models.JSONField(null=True, blank=True)
+    old_values = OrjsonJSONField(null=True, blank=True)
+    new_values = OrjsonJSONField(null=True, blank=True)
 
     ip_address = models.GenericIPAddressField(null=True, blank=True)
     user_agent = models.TextField(blank=True)
@@ -121,8 +147,59 @@ class AuditLog(models.Model):
             models.Index(fields=['user', '-timestamp']),
             models.Index(fields=['resource_type', 'resource_id']),
             models.Index(fields=['-timestamp']),
+            # Covers "recent audit entries for a resource within an organization"
+            models.Index(
+                fields=['organization', 'resource_type', 'resource_id', '-timestamp'],
+                name='audit_org_res_ts_idx',
+                include=['action', 'user'],
+            ),
+            # Containment lookups on the change payloads (new_values__contains=...)
+            GinIndex(fields=['new_values'], name='audit_newvals_gin', opclasses=['jsonb_path_ops']),
+            GinIndex(fields=['old_values'], name='audit_oldvals_gin', opclasses=['jsonb_path_ops']),
         ]
 
     def __str__(self):
         user_name = self.user.username if self.user else 'System'
         return f"{user_name} {self.action} {self.resource_type}:{self.resource_id} at {self.timestamp}"
+
+
+class AuditLogArchive(models.Model):
+    """
+    Cold storage for audit log entries past the retention window
+
+    The full original row is kept as zstd-compressed JSON in payload; only
+    the columns needed to find an entry are stored uncompressed.
+    """
+
+    original_id = models.BigIntegerField()
+    timestamp = models.DateTimeField()
+
+    organization = models.ForeignKey(
+        'organizations.Organization',
+        on_delete=models.CASCADE
+    )
+
+    action = models.CharField(max_length=100)
+    resource_type = models.CharField(max_length=50)
+    resource_id = models.CharField(max_length=255)
+
+    payload = models.BinaryField()
+
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-timestamp']
+        indexes = [
+            models.Index(fields=['organization', '-timestamp']),
+            models.Index(fields=['resource_type', 'resource_id']),
+        ]
+
+    def __str__(self):
+        return f"Archived {self.action} {self.resource_type}:{self.resource_id} at {self.timestamp}"
+
+    def load_payload(self):
+        """Decompress and decode the original audit log row"""
+        import orjson
+        import zstandard
+
+        return orjson.loads(zstandard.ZstdDecompressor().decompress(bytes(self.payload)))
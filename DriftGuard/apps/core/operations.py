@@ -0,0 +1,88 @@
+"""
+Custom migration operations for DriftGuard
+
+Production runs on PostgreSQL while local development defaults to SQLite,
+so these operations use PostgreSQL-specific DDL when it is available and
+fall back to the portable equivalent on other backends.
+"""
+
+from django.contrib.postgres.operations import AddIndexConcurrently, RemoveIndexConcurrently
+from django.db.migrations.operations import AddIndex, RemoveIndex
+
+
+class AddIndexConcurrentlyIfPostgres(AddIndexConcurrently):
+    """
+    Add an index without locking the table for writes
+
+    Uses CREATE INDEX CONCURRENTLY on PostgreSQL and a regular CREATE INDEX
+    elsewhere. Migrations using this operation must set atomic = False.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+        else:
+            AddIndex.database_forwards(self, app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+        else:
+            AddIndex.database_backwards(self, app_label, schema_editor, from_state, to_state)
+
+
+class RemoveIndexConcurrentlyIfPostgres(RemoveIndexConcurrently):
+    """
+    Drop an index without locking the table for writes
+
+    Uses DROP INDEX CONCURRENTLY on PostgreSQL and a regular DROP INDEX
+    elsewhere. Migrations using this operation must set atomic = False.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+        else:
+            RemoveIndex.database_forwards(self, app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+        else:
+            RemoveIndex.database_backwards(self, app_label, schema_editor, from_state, to_state)
+
+
+class AddIndexIfPostgres(AddIndex):
+    """
+    Add an index that only exists on PostgreSQL (GIN, opclasses, ...)
+
+    The index is recorded in the migration state on every backend but the
+    DDL is skipped elsewhere.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+
+class AddPostgresIndexConcurrently(AddIndexConcurrently):
+    """
+    Add a PostgreSQL-only index (GIN, opclasses, ...) without locking the
+    table for writes
+
+    The index is recorded in the migration state on every backend but the
+    DDL is skipped elsewhere. Migrations using this operation must set
+    atomic = False.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
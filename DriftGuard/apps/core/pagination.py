@@ -3,3 +3,19 @@ from rest_framework.pagination import CursorPagination
 class DefaultCursorPagination(CursorPagination):
     page_size = 20
     ordering = '-created_at'  # use correct timestamp field
+
+
+class DriftEventCursorPagination(DefaultCursorPagination):
+    # Walks the (environment, detected_at) indexes instead of OFFSET scans
+    page_size = 50
+    ordering = '-detected_at'
+
+
+class IaCFileCursorPagination(DefaultCursorPagination):
+    # IaC files have no created_at
+    ordering = '-last_modified'
+
+
+class MLPredictionCursorPagination(DefaultCursorPagination):
+    # ML predictions have no created_at
+    ordering = '-predicted_at'
@@ -0,0 +1,203 @@
+"""
+Monthly range partitioning helpers for DriftGuard
+
+On PostgreSQL the audit log table is declaratively partitioned by month on
+its timestamp column (see core migration 0003). Partitions are plain
+tables named <table>_yYYYYmMM; rows outside every monthly partition land in
+<table>_default. All helpers are no-ops on other database backends.
+"""
+
+import logging
+from datetime import datetime, timezone as dt_timezone
+from typing import List
+
+from django.db import connection, transaction
+
+logger = logging.getLogger(__name__)
+
+# Number of future months to keep partitions for, so writes never fall
+# through to the default partition
+AUDIT_LOG_PARTITION_MONTHS_AHEAD = 2
+
+# Table holding audit log rows left behind when core migration 0003
+# rebuilds core_auditlog, until copy_pending_audit_log_rows moves them
+AUDIT_LOG_PENDING_TABLE = 'core_auditlog_pending'
+
+
+def month_start(value: datetime) -> datetime:
+    """
+    Return midnight UTC on the first day of the month containing value
+    """
+    if value.tzinfo is not None:
+        value = value.astimezone(dt_timezone.utc)
+    return datetime(value.year, value.month, 1, tzinfo=dt_timezone.utc)
+
+
+def add_months(value: datetime, months: int) -> datetime:
+    """
+    Shift a month start by a number of months
+    """
+    month_index = value.year * 12 + value.month - 1 + months
+    return value.replace(year=month_index // 12, month=month_index % 12 + 1)
+
+
+def partition_name(table: str, start: datetime) -> str:
+    return f'{table}_y{start.year:04d}m{start.month:02d}'
+
+
+def is_partitioned(cursor, table: str) -> bool:
+    cursor.execute(
+        'SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s)',
+        [table],
+    )
+    return cursor.fetchone() is not None
+
+
+def create_monthly_partition(cursor, table: str, start: datetime) -> str:
+    """
+    Create the partition of table covering the month beginning at start
+
+    Args:
+        cursor: Database cursor on a PostgreSQL connection
+        table: Name of the partitioned parent table
+        start: First instant of the month (see month_start)
+
+    Returns:
+        Name of the partition table
+    """
+    qn = connection.ops.quote_name
+    name = partition_name(table, start)
+    # Partition bounds must be literals, DDL does not accept parameters
+    lower = start.strftime('%Y-%m-%d %H:%M:%S+00')
+    upper = add_months(start, 1).strftime('%Y-%m-%d %H:%M:%S+00')
+    cursor.execute(
+        f"CREATE TABLE IF NOT EXISTS {qn(name)} PARTITION OF {qn(table)} "
+        f"FOR VALUES FROM ('{lower}') TO ('{upper}')"
+    )
+    return name
+
+
+def create_default_partition(cursor, table: str) -> str:
+    qn = connection.ops.quote_name
+    name = f'{table}_default'
+    cursor.execute(f'CREATE TABLE IF NOT EXISTS {qn(name)} PARTITION OF {qn(table)} DEFAULT')
+    return name
+
+
+def drop_empty_partitions_before(cursor, table: str, cutoff: datetime) -> List[str]:
+    """
+    Drop monthly partitions of table that end on or before cutoff and hold
+    no rows. Dropping a partition is O(1), unlike DELETE followed by VACUUM.
+
+    Returns:
+        Names of the dropped partitions
+    """
+    qn = connection.ops.quote_name
+    cursor.execute(
+        'SELECT inhrelid::regclass::text FROM pg_inherits WHERE inhparent = to_regclass(%s)',
+        [table],
+    )
+    prefix = f'{table}_y'
+    dropped = []
+    for (name,) in cursor.fetchall():
+        if not name.startswith(prefix):
+            continue
+        start = datetime(int(name[len(prefix):len(prefix) + 4]), int(name[-2:]), 1, tzinfo=dt_timezone.utc)
+        if add_months(start, 1) > cutoff:
+            continue
+        cursor.execute(f'SELECT 1 FROM {qn(name)} LIMIT 1')
+        if cursor.fetchone() is None:
+            cursor.execute(f'DROP TABLE {qn(name)}')
+            dropped.append(name)
+    return dropped
+
+
+def ensure_audit_log_partitions(months_ahead: int = AUDIT_LOG_PARTITION_MONTHS_AHEAD) -> List[str]:
+    """
+    Make sure audit log partitions exist from the current month onwards
+
+    Safe to run repeatedly; existing partitions are left untouched.
+
+    Returns:
+        Names of the partitions that were checked or created
+    """
+    if connection.vendor != 'postgresql':
+        return []
+
+    from .models import AuditLog
+
+    table = AuditLog._meta.db_table
+    current = month_start(datetime.now(dt_timezone.utc))
+
+    with connection.cursor() as cursor:
+        if not is_partitioned(cursor, table):
+            logger.warning(f"Table {table} is not partitioned; skipping partition maintenance")
+            return []
+
+        return [
+            create_monthly_partition(cursor, table, add_months(current, offset))
+            for offset in range(months_ahead + 1)
+        ]
+
+
+def drop_archived_audit_log_partitions(cutoff: datetime) -> List[str]:
+    """
+    Drop emptied audit log partitions older than cutoff (see archive_audit_logs)
+    """
+    if connection.vendor != 'postgresql':
+        return []
+
+    from .models import AuditLog
+
+    table = AuditLog._meta.db_table
+    with connection.cursor() as cursor:
+        if not is_partitioned(cursor, table):
+            return []
+        return drop_empty_partitions_before(cursor, table, cutoff)
+
+
+def copy_pending_audit_log_rows(batch_size: int) -> int:
+    """
+    Move the rows left in AUDIT_LOG_PENDING_TABLE by core migration 0003
+    into the audit log table, one committed batch at a time, and drop the
+    pending table once it is empty
+
+    Safe to interrupt and rerun; each batch is moved in its own transaction.
+
+    Returns:
+        Number of rows moved
+    """
+    if connection.vendor != 'postgresql':
+        return 0
+
+    from .models import AuditLog
+
+    qn = connection.ops.quote_name
+    table = qn(AuditLog._meta.db_table)
+    pending = qn(AUDIT_LOG_PENDING_TABLE)
+
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT to_regclass(%s)', [AUDIT_LOG_PENDING_TABLE])
+        if cursor.fetchone()[0] is None:
+            return 0
+
+    moved = 0
+    while True:
+        with transaction.atomic(), connection.cursor() as cursor:
+            # Both tables were created with the same column order
+            cursor.execute(
+                f'WITH batch AS ('
+                f'DELETE FROM {pending} WHERE id IN '
+                f'(SELECT id FROM {pending} ORDER BY id LIMIT %s) RETURNING *'
+                f') INSERT INTO {table} SELECT * FROM batch',
+                [batch_size],
+            )
+            count = cursor.rowcount
+        if not count:
+            break
+        moved += count
+        logger.info(f"Moved {moved} audit log rows from {AUDIT_LOG_PENDING_TABLE}")
+
+    with connection.cursor() as cursor:
+        cursor.execute(f'DROP TABLE {pending}')
+    return moved
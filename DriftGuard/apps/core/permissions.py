@@ -1,4 +1,6 @@
-from rest_framework.permissions import BasePermission
+from rest_framework.permissions import BasePermission, SAFE_METHODS
+
+from .middleware import get_auth_context
 
 
 class OrganizationPermission(BasePermission):
@@ -9,7 +11,7 @@ class OrganizationPermission(BasePermission):
 
     def has_object_permission(self, request, view, obj):
         # Check if user has access to the object's organization
-        return obj.organization == request.user.organization
+        return obj.organization_id == get_auth_context(request).organization_id
 
 
 class RoleBasedPermission(BasePermission):
@@ -18,30 +20,26 @@ class RoleBasedPermission(BasePermission):
     Maps HTTP methods to required user roles
     """
 
-    def has_permission(self, request, view):
-        if not request.user.is_authenticated:
-            return False
-
-        # Define permissions per HTTP method
-        method_permissions = {
-            'GET': ['viewer', 'editor', 'admin'],        # Read operations
-            'POST': ['editor', 'admin'],                 # Create operations
-            'PUT': ['editor', 'admin'],                  # Full update operations
-            'PATCH': ['editor', 'admin'],                # Partial update operations
-            'DELETE': ['admin'],                         # Delete operations
-        }
+    # Roles allowed per HTTP method, built once per process
+    METHOD_ROLES = {
+        'GET': frozenset(('viewer', 'editor', 'admin')),    # Read operations
+        'POST': frozenset(('editor', 'admin')),             # Create operations
+        'PUT': frozenset(('editor', 'admin')),              # Full update operations
+        'PATCH': frozenset(('editor', 'admin')),            # Partial update operations
+        'DELETE': frozenset(('admin',)),                    # Delete operations
+    }
+    NO_ROLES = frozenset()
 
-        required_roles = method_permissions.get(request.method, [])
-        return request.user.role in required_roles
+    def has_permission(self, request, view):
+        # Anonymous users have no role and therefore match no method
+        return get_auth_context(request).role in self.METHOD_ROLES.get(request.method, self.NO_ROLES)
 
 
 class AdminPermission(BasePermission):
     """Permission class that requires admin role"""
 
     def has_permission(self, request, view):
-        if not request.user.is_authenticated:
-            return False
-        return request.user.role == 'admin'
+        return get_auth_context(request).role == 'admin'
 
 
 class OrganizationAdminPermission(BasePermission):
@@ -51,14 +49,13 @@ class OrganizationAdminPermission(BasePermission):
     """
 
     def has_permission(self, request, view):
-        if not request.user.is_authenticated:
-            return False
-        return request.user.role == 'admin'
+        return get_auth_context(request).role == 'admin'
 
     def has_object_permission(self, request, view, obj):
+        context = get_auth_context(request)
         return (
-            request.user.role == 'admin' and
-            obj.organization == request.user.organization
+            context.role == 'admin' and
+            obj.organization_id == context.organization_id
         )
 
 
@@ -68,11 +65,13 @@ class IsOwnerOrAdmin(BasePermission):
     """
 
     def has_object_permission(self, request, view, obj):
-        # Allow if user owns the object or is an admin in the same organization
+        context = get_auth_context(request)
+        # Allow if user owns the object or is an admin in the same organization.
+        # Anonymous users have no id, which must not match an ownerless object
         return (
-            obj.user == request.user or
-            (request.user.role == 'admin' and
-             obj.organization == request.user.organization)
+            (request.user.is_authenticated and obj.user_id == request.user.id) or
+            (context.role == 'admin' and
+             obj.organization_id == context.organization_id)
         )
 
 
@@ -82,25 +81,30 @@ class ReadOnlyOrAdmin(BasePermission):
     but write access only to administrators
     """
 
+    READ_METHODS = frozenset(SAFE_METHODS)
+
     def has_permission(self, request, view):
-        if not request.user.is_authenticated:
+        context = get_auth_context(request)
+        if context.role is None:
             return False
 
         # Read operations allowed
-        if request.method in ['GET', 'HEAD', 'OPTIONS']:
+        if request.method in self.READ_METHODS:
             return True
 
         # Write operations require admin role
-        return request.user.role == 'admin'
+        return context.role == 'admin'
 
     def has_object_permission(self, request, view, obj):
+        context = get_auth_context(request)
+
         # Organization-scoped read/write permissions
-        if request.method in ['GET', 'HEAD', 'OPTIONS']:
-            return obj.organization == request.user.organization
+        if request.method in self.READ_METHODS:
+            return obj.organization_id == context.organization_id
 
         return (
-            request.user.role == 'admin' and
-            obj.organization == request.user.organization
+            context.role == 'admin' and
+            obj.organization_id == context.organization_id
         )
 
 
@@ -111,18 +115,18 @@ class MLModelAccessPermission(BasePermission):
     """
 
     def has_permission(self, request, view):
-        if not request.user.is_authenticated:
-            return False
-        return True  # All authenticated users can access ML endpoints
+        # All authenticated users can access ML endpoints
+        return get_auth_context(request).role is not None
 
     def has_object_permission(self, request, view, obj):
         # ML models and predictions are organization-scoped
         if hasattr(obj, 'drift_event'):
-            # For predictions, check the drift event's organization
-            return obj.drift_event.environment.organization == request.user.organization
+            # For predictions, check the drift event's organization; views
+            # select_related('drift_event__environment') so this is query free
+            return obj.drift_event.environment.organization_id == get_auth_context(request).organization_id
 
         # For ML models, all organization members can access
-        return obj.organization == request.user.organization
+        return obj.organization_id == get_auth_context(request).organization_id
 
 
 class AuditLogPermission(BasePermission):
@@ -132,12 +136,11 @@ class AuditLogPermission(BasePermission):
     """
 
     def has_permission(self, request, view):
-        if not request.user.is_authenticated:
-            return False
-        return request.user.role == 'admin'
+        return get_auth_context(request).role == 'admin'
 
     def has_object_permission(self, request, view, obj):
+        context = get_auth_context(request)
         return (
-            request.user.role == 'admin' and
-            obj.organization == request.user.organization
+            context.role == 'admin' and
+            obj.organization_id == context.organization_id
         )
@@ -0,0 +1,36 @@
+"""
+Response renderers for DriftGuard
+"""
+
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+# Datetimes go through DRF's encoder so responses keep its 'Z' suffix
+ORJSON_RENDER_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+class OrjsonRenderer(JSONRenderer):
+    """
+    JSONRenderer that encodes compact responses with orjson
+
+    Types orjson cannot handle natively (Decimal, lazy translation strings,
+    datetimes, ...) fall back to DRF's JSONEncoder. Indented output, as
+    requested by the browsable API or an 'indent' media type parameter,
+    is left to JSONRenderer.
+    """
+
+    _fallback = JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        renderer_context = renderer_context or {}
+        if self.get_indent(accepted_media_type, renderer_context) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(data, default=self._fallback.default, option=ORJSON_RENDER_OPTIONS)
+
+        # Same strict javascript subset escaping as JSONRenderer
+        return ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
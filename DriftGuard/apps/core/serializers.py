@@ -1,85 +1,110 @@
+import copy
+import logging
+
 from django.contrib.auth import authenticate
 from rest_framework import serializers
-from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.organizations.models import Organization
 
 from .models import User
+from .tokens import UserClaimsRefreshToken
+
+logger = logging.getLogger(__name__)
+
+
+class CachedFieldsMixin:
+    """
+    Build a serializer class's fields once and hand each instance copies
+
+    ModelSerializer.get_fields() introspects the model on every
+    instantiation. Fields are built once per class here and deep-copied
+    per instance, the way DRF copies declared fields, so nested
+    serializers, child fields and choices are never shared between
+    instances. Only for serializers whose fields do not depend on
+    instance state or context.
+    """
 
+    _fields_cache = {}
+
+    def get_fields(self):
+        cls = type(self)
+        fields = self._fields_cache.get(cls)
+        if fields is None:
+            fields = self._fields_cache[cls] = super().get_fields()
+        return copy.deepcopy(fields)
 
-# def authenticate_user(email_or_username, password):
-#     """
-#     Custom authentication that supports login with either email or username
-#     """
-#     # First try to authenticate as username
-#     user = authenticate(username=email_or_username, password=password)
-   
-#     if user:
-#         print("auth one done", user)
-#         return user
-
-#     # If that fails, try to find user by email and authenticate
-#     try:
-#         custom_user = User.objects.get(email=email_or_username)
-#         print("auth one failed, looking at two")
-#         # Try to authenticate with the actual username found by email
-#         user = authenticate(username=custom_user.username, password=password)
-#         if user:
-#             return user
-#     except Exception as e:
-#         print("exceptions: ",e)
-        
-
-#     return None
 
 def authenticate_user(email_or_username, password):
+    """
+    Authenticate with either email or username
+
+    EmailOrUsernameBackend resolves both identifiers in a single query and
+    verifies the password exactly once.
+    """
     return authenticate(username=email_or_username, password=password)
 
+
+class OrganizationSummarySerializer(serializers.ModelSerializer):
+    """Minimal organization representation embedded in user payloads"""
+
+    class Meta:
+        model = Organization
+        fields = ['id', 'name', 'slug']
+        read_only_fields = fields
+
+
+class UserPayloadSerializer(serializers.ModelSerializer):
+    """User payload returned by login, current user and token verify endpoints"""
+
+    organization = OrganizationSummarySerializer(read_only=True)
+
+    class Meta:
+        model = User
+        fields = ['id', 'username', 'email', 'organization', 'role', 'is_staff', 'is_active']
+        read_only_fields = fields
+
+
+class TokenUserPayloadSerializer(UserPayloadSerializer):
+    """User payload returned by token verify, limited to the claims carried in tokens"""
+
+    class Meta(UserPayloadSerializer.Meta):
+        fields = ['id', 'username', 'organization', 'role']
+        read_only_fields = fields
+
 class LoginSerializer(serializers.Serializer):
     """Serializer for user login (supports both username and email)"""
     email_or_username = serializers.CharField(required=True, help_text="Email address or username")
     password = serializers.CharField(required=True, write_only=True)
 
     def validate(self, attrs):
-        print("validating now")
         email_or_username = attrs.get('email_or_username')
         password = attrs.get('password')
 
         if not email_or_username or not password:
             raise serializers.ValidationError('Both email/username and password are required')
 
-        print(f"DEBUG: Trying to authenticate user: {email_or_username}")
+        logger.debug("Authentication attempt for %s", email_or_username)
 
         user = authenticate_user(email_or_username, password)
         if not user:
-            print(f"DEBUG: Authentication failed for user: {email_or_username}")
+            logger.debug("Authentication failed for %s", email_or_username)
             raise serializers.ValidationError('Invalid credentials')
 
         if not user.is_active:
             raise serializers.ValidationError('User account is disabled')
 
-        print(f"DEBUG: Successfully authenticated user: {user.username}")
+        logger.debug("Authenticated user %s", user.username)
         attrs['user'] = user
         return attrs
 
     def create(self, validated_data):
         user = validated_data['user']
-        refresh = RefreshToken.for_user(user)
+        refresh = UserClaimsRefreshToken.for_user(user)
 
         return {
             'refresh': str(refresh),
             'access': str(refresh.access_token),
-            'user': {
-                'id': user.id,
-                'username': user.username,
-                'email': user.email,
-                'organization': {
-                    'id': user.organization.id,
-                    'name': user.organization.name,
-                    'slug': user.organization.slug,
-                } if hasattr(user, 'organization') and user.organization else None,
-                'role': user.role,
-                'is_staff': user.is_staff,
-                'is_active': user.is_active,
-            }
+            'user': UserPayloadSerializer(user).data,
         }
 
 
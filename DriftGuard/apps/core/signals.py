@@ -1 +1,37 @@
 # Django signals handlers for core app
+
+from django.core.exceptions import ObjectDoesNotExist
+from django.db.models.signals import post_delete, post_save
+
+from .caching import bump_list_version
+
+# Models rendered by the conditional list endpoints (and the organization
+# stats cached under the list version), with the path from each instance to
+# its organization id. Writes to these models that send no signals (bulk
+# writes and queryset update()) must call bump_list_version themselves, as
+# _write_drift_events does
+LIST_VERSION_SOURCES = {
+    'organizations.Organization': ('pk',),
+    'environments.Environment': ('organization_id',),
+    'environments.CloudCredential': ('environment', 'organization_id'),
+    'drifts.DriftEvent': ('environment', 'organization_id'),
+    'iac.IaCRepository': ('organization_id',),
+    'iac.IaCFile': ('repository', 'organization_id'),
+    'iac.IaCResource': ('iac_file', 'repository', 'organization_id'),
+}
+
+
+def _bump_list_version(sender, instance, **kwargs):
+    value = instance
+    try:
+        for attr in LIST_VERSION_SOURCES[sender._meta.label]:
+            value = getattr(value, attr)
+    except ObjectDoesNotExist:
+        # The parent is being deleted as well and bumps the version itself
+        return
+    bump_list_version(value)
+
+
+for _label in LIST_VERSION_SOURCES:
+    post_save.connect(_bump_list_version, sender=_label, dispatch_uid=f'list-version-save:{_label}')
+    post_delete.connect(_bump_list_version, sender=_label, dispatch_uid=f'list-version-delete:{_label}')
@@ -0,0 +1,37 @@
+from celery import shared_task
+from django.utils import timezone
+
+from .models import UserSession
+from .partitioning import ensure_audit_log_partitions
+from .utils import archive_audit_logs
+
+
+@shared_task
+def create_audit_log_partitions():
+    """
+    Pre-create upcoming monthly audit log partitions (scheduled by celery beat)
+    """
+    return ensure_audit_log_partitions()
+
+
+@shared_task
+def archive_cold_audit_logs():
+    """
+    Move audit log entries past the retention window into compressed storage
+    """
+    return archive_audit_logs()
+
+
+@shared_task
+def deactivate_expired_sessions():
+    """
+    Mark expired sessions inactive so they drop out of the partial
+    active-session indexes
+
+    Returns:
+        Number of sessions deactivated
+    """
+    return UserSession.objects.filter(
+        is_active=True,
+        expires_at__lt=timezone.now()
+    ).update(is_active=False)
@@ -0,0 +1,48 @@
+"""
+Shared fixtures for the DriftGuard test suites
+"""
+
+from types import SimpleNamespace
+
+from django.utils import timezone
+
+from apps.environments.models import Environment
+from apps.iac.models import IaCFile, IaCRepository, IaCResource
+from apps.organizations.models import Organization
+from .models import User
+
+# Tests must not depend on the Redis server configured in settings
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+def create_iac_file(organization, created_by):
+    """Create a repository of the organization holding one Terraform file"""
+    repository = IaCRepository.objects.create(
+        name='infra', repository_url='https://github.com/acme/infra', repository_owner='acme',
+        repository_name='infra', organization=organization, created_by=created_by
+    )
+    return IaCFile.objects.create(
+        repository=repository, file_path='main.tf', file_name='main.tf', file_type='.tf',
+        content_hash='0' * 64, last_modified=timezone.now()
+    )
+
+
+def create_resource_graph(role='editor', resource_definition='{}'):
+    """
+    Create an organization with one user, environment and IaC resource
+
+    Returns:
+        Namespace with organization, user, environment, iac_file and resource
+    """
+    organization = Organization.objects.create(name='Acme', slug='acme')
+    user = User.objects.create_user(username=role, password='pw', organization=organization, role=role)
+    environment = Environment.objects.create(
+        organization=organization, name='Prod', slug='prod', cloud_provider='aws'
+    )
+    iac_file = create_iac_file(organization, user)
+    resource = IaCResource.objects.create(
+        iac_file=iac_file, resource_id='web', resource_definition=resource_definition
+    )
+    return SimpleNamespace(
+        organization=organization, user=user, environment=environment, iac_file=iac_file, resource=resource
+    )
@@ -0,0 +1,472 @@
+import json
+import os
+import subprocess
+import sys
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest import mock, skipIf
+
+import orjson
+import zstandard
+from cryptography.exceptions import InvalidTag
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from apps.drifts.models import DriftEvent
+from apps.environments.models import CloudCredential, Environment
+from apps.iac.models import IaCResource
+from apps.organizations.models import Organization
+from . import partitioning
+from .backends import EmailOrUsernameBackend
+from .fields import ENCRYPTED_PREFIX, OrjsonDecoder, OrjsonEncoder, decrypt_value, encrypt_value
+from .models import AuditLog, AuditLogArchive, User
+from .permissions import IsOwnerOrAdmin
+from .tokens import UserClaimsRefreshToken, user_payload_from_token
+from .serializers import CachedFieldsMixin, OrganizationSummarySerializer, TokenUserPayloadSerializer
+from .testing import LOCMEM_CACHES, create_resource_graph
+from .utils import _write_drift_events, calculate_risk_assessment_batch, archive_audit_logs, perform_drift_detection
+
+# Nothing listens on port 1, so every cache call fails to connect
+UNREACHABLE_CACHES = {
+    'default': {
+        'BACKEND': 'django_redis.cache.RedisCache',
+        'LOCATION': 'redis://127.0.0.1:1/0',
+        'OPTIONS': {'CLIENT_CLASS': 'django_redis.client.DefaultClient'},
+    }
+}
+
+
+class RiskAssessmentBatchTests(SimpleTestCase):
+
+    def test_severity_threshold_boundary(self):
+        """A stored severity of 0.70 counts as high, as in the per-event comparison"""
+        events = [
+            DriftEvent(severity_score=Decimal('0.70')),
+            DriftEvent(severity_score=Decimal('0.69')),
+        ]
+
+        high, low = calculate_risk_assessment_batch(events)
+
+        self.assertEqual(high['factors']['security_impact'], 0.8)
+        self.assertEqual(low['factors']['security_impact'], 0.3)
+        self.assertAlmostEqual(high['overall_risk'], (0.8 + 0.5 + 0.6 + 0.4) / 4)
+
+
+class PartitioningHelperTests(SimpleTestCase):
+
+    def test_month_start_normalizes_to_utc(self):
+        value = datetime(2026, 3, 1, 0, 30, tzinfo=dt_timezone(timedelta(hours=2)))
+
+        self.assertEqual(partitioning.month_start(value), datetime(2026, 2, 1, tzinfo=dt_timezone.utc))
+
+    def test_add_months_crosses_year_boundaries(self):
+        start = datetime(2026, 11, 1, tzinfo=dt_timezone.utc)
+
+        self.assertEqual(partitioning.add_months(start, 2), datetime(2027, 1, 1, tzinfo=dt_timezone.utc))
+        self.assertEqual(partitioning.add_months(start, -11), datetime(2025, 12, 1, tzinfo=dt_timezone.utc))
+
+    def test_partition_name(self):
+        start = datetime(2026, 4, 1, tzinfo=dt_timezone.utc)
+
+        self.assertEqual(partitioning.partition_name('core_auditlog', start), 'core_auditlog_y2026m04')
+
+
+class PartitioningMaintenanceTests(TestCase):
+
+    @skipIf(connection.vendor == 'postgresql', 'partition maintenance is a no-op on other backends only')
+    def test_maintenance_is_a_no_op_without_postgresql(self):
+        self.assertEqual(partitioning.ensure_audit_log_partitions(), [])
+        self.assertEqual(partitioning.copy_pending_audit_log_rows(100), 0)
+
+
+class AuditLogArchiveTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.organization = Organization.objects.create(name='Acme', slug='acme')
+        cls.old = AuditLog.objects.create(
+            timestamp=timezone.now() - timedelta(days=400), organization=cls.organization,
+            action='UPDATE', resource_type='environment', resource_id='7', new_values={'region': 'eu-west-1'}
+        )
+        cls.recent = AuditLog.objects.create(
+            organization=cls.organization, action='CREATE', resource_type='environment', resource_id='8'
+        )
+
+    @override_settings(DRIFTGUARD_BULK_BATCH_SIZE=1)
+    def test_old_entries_are_moved_to_the_archive(self):
+        self.assertEqual(archive_audit_logs(older_than_days=365), 1)
+
+        self.assertEqual(list(AuditLog.objects.values_list('id', flat=True)), [self.recent.pk])
+        archived = AuditLogArchive.objects.get()
+        self.assertEqual(archived.original_id, self.old.pk)
+        self.assertEqual(archived.timestamp, self.old.timestamp)
+        self.assertEqual((archived.action, archived.resource_id), ('UPDATE', '7'))
+
+        payload = orjson.loads(zstandard.ZstdDecompressor().decompress(bytes(archived.payload)))
+        self.assertEqual(payload['id'], self.old.pk)
+        self.assertEqual(payload['new_values'], {'region': 'eu-west-1'})
+
+    def test_nothing_to_archive(self):
+        self.assertEqual(archive_audit_logs(older_than_days=36500), 0)
+        self.assertEqual(AuditLog.objects.count(), 2)
+
+
+class OrjsonCodecTests(SimpleTestCase):
+
+    def test_naive_datetime_is_encoded_without_offset(self):
+        # Same output as DjangoJSONEncoder, which does not assume UTC
+        self.assertEqual(
+            json.dumps({'at': datetime(2024, 1, 2, 3, 4, 5)}, cls=OrjsonEncoder),
+            '{"at":"2024-01-02T03:04:05"}'
+        )
+
+    def test_decodes_like_json(self):
+        self.assertEqual(json.loads('{"a": [1, 2.5, null]}', cls=OrjsonDecoder), {'a': [1, 2.5, None]})
+
+    def test_decoder_hooks_are_honored(self):
+        self.assertEqual(json.loads('{"a": 1.5}', cls=OrjsonDecoder, parse_float=Decimal), {'a': Decimal('1.5')})
+        self.assertEqual(
+            json.loads('{"a": 1}', cls=OrjsonDecoder, object_hook=lambda d: sorted(d)),
+            ['a']
+        )
+
+
+class EncryptedFieldTests(TestCase):
+
+    def test_round_trip(self):
+        stored = encrypt_value('s3cr3t')
+
+        self.assertTrue(stored.startswith(ENCRYPTED_PREFIX))
+        self.assertNotIn('s3cr3t', stored)
+        self.assertEqual(decrypt_value(stored), 's3cr3t')
+
+    def test_each_encryption_uses_a_fresh_nonce(self):
+        self.assertNotEqual(encrypt_value('s3cr3t'), encrypt_value('s3cr3t'))
+
+    def test_plaintext_with_the_prefix_is_encrypted(self):
+        value = ENCRYPTED_PREFIX + 'not-base64'
+        stored = encrypt_value(value)
+
+        self.assertNotEqual(stored, value)
+        self.assertEqual(decrypt_value(stored), value)
+
+    def test_legacy_plaintext_and_empty_values_pass_through(self):
+        self.assertEqual(decrypt_value('plain-secret'), 'plain-secret')
+        self.assertEqual(decrypt_value(''), '')
+        self.assertIsNone(decrypt_value(None))
+        self.assertIsNone(encrypt_value(None))
+
+    def test_field_stores_ciphertext_and_reads_legacy_plaintext(self):
+        organization = Organization.objects.create(name='Acme', slug='acme')
+        environment = Environment.objects.create(
+            organization=organization, name='Prod', slug='prod', cloud_provider='aws'
+        )
+        credential = CloudCredential.objects.create(
+            environment=environment, credential_type='aws_access_keys', name='deploy',
+            aws_access_key_id='AKIA', aws_secret_access_key='s3cr3t'
+        )
+        table = CloudCredential._meta.db_table
+
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT aws_secret_access_key FROM {table} WHERE id = %s', [credential.pk])
+            self.assertTrue(cursor.fetchone()[0].startswith(ENCRYPTED_PREFIX))
+            # A row written before the field was encrypted
+            cursor.execute(f'UPDATE {table} SET azure_client_secret = %s WHERE id = %s', ['legacy', credential.pk])
+
+        credential = CloudCredential.objects.get(pk=credential.pk)
+        self.assertEqual(credential.aws_secret_access_key, 's3cr3t')
+        self.assertEqual(credential.azure_client_secret, 'legacy')
+
+        # Saving a loaded credential encrypts its plaintext exactly once
+        credential.aws_secret_access_key = ENCRYPTED_PREFIX + 's3cr3t'
+        credential.save()
+        credential = CloudCredential.objects.get(pk=credential.pk)
+        self.assertEqual(credential.aws_secret_access_key, ENCRYPTED_PREFIX + 's3cr3t')
+        self.assertEqual(credential.azure_client_secret, 'legacy')
+
+    def test_key_change_makes_secrets_unreadable(self):
+        stored = encrypt_value('s3cr3t')
+
+        with override_settings(CREDENTIALS_ENCRYPTION_KEY='another-key'):
+            with self.assertRaises(InvalidTag):
+                decrypt_value(stored)
+
+
+class CredentialsEncryptionKeySettingTests(SimpleTestCase):
+
+    def _load_settings(self, **env):
+        environ = {k: v for k, v in os.environ.items() if k not in ('DEBUG', 'CREDENTIALS_ENCRYPTION_KEY')}
+        environ.update(env)
+        return subprocess.run(
+            [sys.executable, '-c', 'import driftguard.settings'],
+            cwd=settings.BASE_DIR, env=environ, capture_output=True, text=True
+        )
+
+    def test_required_when_debug_is_off(self):
+        result = self._load_settings(DEBUG='False')
+
+        self.assertNotEqual(result.returncode, 0)
+        self.assertIn('CREDENTIALS_ENCRYPTION_KEY must be set', result.stderr)
+
+    def test_set_key_is_accepted_when_debug_is_off(self):
+        result = self._load_settings(DEBUG='False', CREDENTIALS_ENCRYPTION_KEY='k')
+
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class DriftDetectionTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        graph = create_resource_graph(resource_definition='{"ami": "ami-123"}')
+        cls.environment = graph.environment
+        cls.valid = graph.resource
+        IaCResource.objects.create(iac_file=graph.iac_file, resource_id='db', resource_definition='{not json')
+
+    @mock.patch('apps.core.utils._has_drift', return_value=True)
+    def test_malformed_definition_is_skipped(self, _has_drift):
+        with self.assertLogs('apps.core.utils', 'WARNING'):
+            result = perform_drift_detection(self.environment.pk)
+
+        self.assertTrue(result['success'])
+        self.assertEqual(result['drifts_count'], 1)
+        drift = DriftEvent.objects.get()
+        self.assertEqual(drift.iac_resource_id, self.valid.pk)
+        self.assertEqual(drift.declared_state, {'ami': 'ami-123'})
+
+
+@override_settings(CACHES=UNREACHABLE_CACHES)
+class ConditionalListCacheFailureTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.organization = Organization.objects.create(name='Acme', slug='acme')
+        cls.user = User.objects.create_user(
+            username='editor', password='pw', organization=cls.organization, role='editor'
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_writes_succeed_without_the_cache(self):
+        with self.assertLogs('apps.core.caching', 'WARNING'):
+            with self.captureOnCommitCallbacks(execute=True):
+                Environment.objects.create(
+                    organization=self.organization, name='Prod', slug='prod', cloud_provider='aws'
+                )
+
+        self.assertTrue(Environment.objects.filter(slug='prod').exists())
+
+    def test_list_is_served_without_an_etag(self):
+        with self.assertLogs('apps.core.caching', 'WARNING'):
+            response = self.client.get('/api/v1/environments/', HTTP_ACCEPT='application/json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('ETag', response)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ConditionalListTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        graph = create_resource_graph()
+        cls.organization = graph.organization
+        cls.user = graph.user
+        cls.environment = graph.environment
+        cls.resource = graph.resource
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _list(self, etag=None):
+        headers = {'HTTP_IF_NONE_MATCH': etag} if etag else {}
+        return self.client.get('/api/v1/environments/', HTTP_ACCEPT='application/json', **headers)
+
+    def test_unchanged_list_is_not_modified(self):
+        etag = self._list()['ETag']
+
+        self.assertEqual(self._list(etag).status_code, 304)
+
+    def test_save_changes_the_etag(self):
+        etag = self._list()['ETag']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.environment.region = 'us-east-1'
+            self.environment.save()
+
+        response = self._list(etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_bulk_drift_event_write_changes_the_etag(self):
+        etag = self._list()['ETag']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            _write_drift_events(DriftEvent, [DriftEvent(
+                environment=self.environment, iac_resource=self.resource,
+                drift_type='modified', declared_state={}
+            )])
+
+        response = self._list(etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['results'][0]['drift_count'], 1)
+
+
+class _NestedCachedSerializer(CachedFieldsMixin, serializers.ModelSerializer):
+    organization = OrganizationSummarySerializer(read_only=True)
+    tags = serializers.ListField(child=serializers.CharField(), required=False)
+
+    class Meta:
+        model = User
+        fields = ['id', 'username', 'role', 'organization', 'tags']
+
+
+class CachedFieldsMixinTests(SimpleTestCase):
+
+    def test_instances_do_not_share_fields(self):
+        first = _NestedCachedSerializer(context={'request': 'first'})
+        second = _NestedCachedSerializer(context={'request': 'second'})
+
+        for name in ('organization', 'tags', 'role'):
+            self.assertIsNot(first.fields[name], second.fields[name])
+        self.assertIsNot(first.fields['tags'].child, second.fields['tags'].child)
+        self.assertIsNot(first.fields['organization'].fields['name'], second.fields['organization'].fields['name'])
+        self.assertIsNot(first.fields['role'].choices, second.fields['role'].choices)
+
+    def test_nested_fields_are_bound_to_their_own_instance(self):
+        first = _NestedCachedSerializer(context={'request': 'first'})
+        second = _NestedCachedSerializer(context={'request': 'second'})
+
+        self.assertEqual(first.fields['organization'].fields['name'].context['request'], 'first')
+        self.assertEqual(second.fields['organization'].fields['name'].context['request'], 'second')
+        self.assertIs(first.fields['tags'].child.root, first)
+        self.assertIs(second.fields['tags'].child.root, second)
+
+
+class EmailOrUsernameBackendTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        organization = Organization.objects.create(name='Acme', slug='acme')
+        cls.alice = User.objects.create_user(
+            username='alice', email='Alice@example.com', password='pw-alice', organization=organization
+        )
+        # Username equal to another user's email
+        cls.bob = User.objects.create_user(
+            username='Alice@example.com', email='bob@example.com', password='pw-bob', organization=organization
+        )
+        cls.backend = EmailOrUsernameBackend()
+
+    def test_username(self):
+        self.assertEqual(self.backend.authenticate(None, username='alice', password='pw-alice'), self.alice)
+
+    def test_exact_email(self):
+        self.assertEqual(self.backend.authenticate(None, username='bob@example.com', password='pw-bob'), self.bob)
+
+    def test_email_is_matched_case_sensitively(self):
+        self.assertIsNone(self.backend.authenticate(None, username='BOB@example.com', password='pw-bob'))
+
+    def test_username_match_wins_over_email_match(self):
+        self.assertEqual(self.backend.authenticate(None, username='Alice@example.com', password='pw-bob'), self.bob)
+        self.assertIsNone(self.backend.authenticate(None, username='Alice@example.com', password='pw-alice'))
+
+    def test_wrong_password_and_unknown_user(self):
+        self.assertIsNone(self.backend.authenticate(None, username='alice', password='wrong'))
+        self.assertIsNone(self.backend.authenticate(None, username='nobody', password='pw-alice'))
+
+    def test_inactive_user(self):
+        User.objects.filter(pk=self.alice.pk).update(is_active=False)
+
+        self.assertIsNone(self.backend.authenticate(None, username='alice', password='pw-alice'))
+
+
+class TokenClaimsTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        organization = Organization.objects.create(name='Acme', slug='acme')
+        cls.user = User.objects.create_user(
+            username='editor', email='editor@example.com', password='pw', organization=organization, role='editor'
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_access_token_carries_the_user_claims(self):
+        access = UserClaimsRefreshToken.for_user(self.user).access_token
+
+        self.assertEqual(user_payload_from_token(access), TokenUserPayloadSerializer(self.user).data)
+
+    def test_tokens_without_claims_have_no_payload(self):
+        self.assertIsNone(user_payload_from_token(RefreshToken.for_user(self.user).access_token))
+
+    def test_login_issues_tokens_with_claims(self):
+        response = self.client.post(
+            '/api/v1/auth/login/', {'email_or_username': 'editor', 'password': 'pw'}, format='json'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        access = AccessToken(response.data['access'])
+        self.assertEqual(access['role'], 'editor')
+        self.assertEqual(access['organization']['slug'], 'acme')
+
+    def test_verify_reads_the_user_from_the_claims(self):
+        token = str(UserClaimsRefreshToken.for_user(self.user).access_token)
+        # Claims are a snapshot from login
+        User.objects.filter(pk=self.user.pk).update(role='viewer')
+
+        response = self.client.post('/api/v1/auth/verify/', {'token': token}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['user']['role'], 'editor')
+
+    def test_verify_rejects_deleted_users_for_both_kinds_of_token(self):
+        tokens = [
+            str(UserClaimsRefreshToken.for_user(self.user).access_token),
+            str(RefreshToken.for_user(self.user).access_token),
+        ]
+        User.objects.filter(pk=self.user.pk).delete()
+
+        for token in tokens:
+            response = self.client.post('/api/v1/auth/verify/', {'token': token}, format='json')
+            self.assertEqual(response.status_code, 401)
+
+    def test_verify_falls_back_to_the_database_for_tokens_without_claims(self):
+        token = str(RefreshToken.for_user(self.user).access_token)
+
+        response = self.client.post('/api/v1/auth/verify/', {'token': token}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['user'], TokenUserPayloadSerializer(self.user).data)
+
+
+class IsOwnerOrAdminTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        organization = Organization.objects.create(name='Acme', slug='acme')
+        cls.owner = User.objects.create_user(username='owner', password='pw', organization=organization)
+
+    def _allowed(self, user, owner_id):
+        request = SimpleNamespace(user=user)
+        obj = SimpleNamespace(user_id=owner_id, organization_id=None)
+        return IsOwnerOrAdmin().has_object_permission(request, None, obj)
+
+    def test_owner_is_allowed(self):
+        self.assertTrue(self._allowed(self.owner, self.owner.pk))
+
+    def test_anonymous_user_does_not_own_ownerless_objects(self):
+        self.assertFalse(self._allowed(AnonymousUser(), None))
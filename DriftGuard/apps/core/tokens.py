@@ -0,0 +1,45 @@
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+class UserClaimsRefreshToken(RefreshToken):
+    """
+    Refresh token carrying the user's name, role and organization as claims
+
+    Access tokens derived from it (on login and on refresh) copy the claims,
+    so token verification can describe the user without loading it; it
+    only checks that the user still exists. The claims are a snapshot from
+    login: a user whose role or organization changes is reported with the
+    old values until they log in again (at most REFRESH_TOKEN_LIFETIME).
+    Permission checks read the user from the database and are not affected.
+    """
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token['username'] = user.username
+        token['role'] = user.role
+        token['organization'] = {
+            'id': user.organization_id,
+            'name': user.organization.name,
+            'slug': user.organization.slug,
+        }
+        return token
+
+
+def user_payload_from_token(token):
+    """
+    Build the token verify user payload from token claims, matching
+    TokenUserPayloadSerializer
+
+    Returns None for tokens issued without the user claims.
+    """
+    if 'role' not in token:
+        return None
+    return {
+        # simplejwt stores the user id claim as a string
+        'id': int(token[api_settings.USER_ID_CLAIM]),
+        'username': token['username'],
+        'organization': token['organization'],
+        'role': token['role'],
+    }
@@ -5,10 +5,20 @@ from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.viewsets import GenericViewSet
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken, UntypedToken
 from rest_framework_simplejwt.views import TokenVerifyView
 
 from .models import User
+from .serializers import TokenUserPayloadSerializer, UserPayloadSerializer
+from .tokens import user_payload_from_token
+
+# Columns needed to build the user payload, including the joined organization
+USER_PAYLOAD_FIELDS = (
+    'id', 'username', 'email', 'role', 'is_staff', 'is_active',
+    'organization__id', 'organization__name', 'organization__slug',
+)
 
 
 class CurrentUserView(APIView):
@@ -17,20 +27,10 @@ class CurrentUserView(APIView):
     """
 
     def get(self, request):
-        user = request.user
-        return Response({
-            'id': user.id,
-            'username': user.username,
-            'email': user.email,
-            'organization': {
-                'id': user.organization.id,
-                'name': user.organization.name,
-                'slug': user.organization.slug,
-            } if hasattr(user, 'organization') and user.organization else None,
-            'role': user.role,
-            'is_staff': user.is_staff,
-            'is_active': user.is_active,
-        })
+        user = User.objects.select_related('organization').only(
+            *USER_PAYLOAD_FIELDS
+        ).get(pk=request.user.pk)
+        return Response(UserPayloadSerializer(user).data)
 
 
 class TokenVerifyView(TokenVerifyView):
@@ -42,18 +42,25 @@ class TokenVerifyView(TokenVerifyView):
         response = super().post(request, *args, **kwargs)
 
         if response.status_code == status.HTTP_200_OK:
-            # Add user info to successful token verification
-            user = User.objects.get(id=request.user.id)
-            response.data['user'] = {
-                'id': user.id,
-                'username': user.username,
-                'organization': {
-                    'id': user.organization.id,
-                    'name': user.organization.name,
-                    'slug': user.organization.slug,
-                } if hasattr(user, 'organization') and user.organization else None,
-                'role': user.role,
-            }
+            # Add user info to successful token verification, read from the
+            # token claims so only the user's existence is checked (the
+            # claims are as of login, see UserClaimsRefreshToken)
+            token = UntypedToken(request.data['token'])
+            user_id = token[api_settings.USER_ID_CLAIM]
+            payload = user_payload_from_token(token)
+            if payload is None:
+                # Tokens issued before the user claims were added
+                try:
+                    user = User.objects.select_related('organization').only(
+                        *USER_PAYLOAD_FIELDS
+                    ).get(id=user_id)
+                except User.DoesNotExist:
+                    raise InvalidToken('User not found')
+                payload = TokenUserPayloadSerializer(user).data
+            elif not User.objects.filter(id=user_id).exists():
+                # Deleted users fail verification whichever kind of token they hold
+                raise InvalidToken('User not found')
+            response.data['user'] = payload
 
         return response
 
@@ -67,8 +74,6 @@ class LoginView(APIView):
 
     def post(self, request):
         from .serializers import LoginSerializer
-        print("logging in now")
-        print(request.data)
         serializer = LoginSerializer(data=request.data)
         if serializer.is_valid():
             return Response(serializer.save(), status=status.HTTP_200_OK)
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-15 17:54
+
+from django.db import migrations, models
+
+from apps.core.operations import AddIndexConcurrentlyIfPostgres
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('drifts', '0002_initial'),
+        ('environments', '0002_cloudcredential'),
+        ('iac', '0002_iacfile_alter_iacrepository_options_and_more'),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyIfPostgres(
+            model_name='driftevent',
+            index=models.Index(fields=['environment', 'resolved_at', 'severity_score'], name='drift_env_res_sev_idx'),
+        ),
+        AddIndexConcurrentlyIfPostgres(
+            model_name='driftevent',
+            index=models.Index(condition=models.Q(('resolved_at__isnull', True)), fields=['environment', '-detected_at'], name='drift_unresolved_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-15 17:58
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+from apps.core.operations import AddPostgresIndexConcurrently
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('drifts', '0003_driftevent_scope_indexes'),
+        ('environments', '0005_environment_tags_gin'),
+        ('iac', '0002_iacfile_alter_iacrepository_options_and_more'),
+    ]
+
+    operations = [
+        AddPostgresIndexConcurrently(
+            model_name='driftevent',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['tags'], name='drift_tags_gin', opclasses=['jsonb_path_ops']),
+        ),
+    ]
@@ -1,3 +1,4 @@
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 from django.core.validators import MaxValueValidator, MinValueValidator
 from apps.environments.models import Environment
@@ -99,6 +100,19 @@ class DriftEvent(models.Model):
             models.Index(fields=['iac_resource', 'resolved_at']),
             models.Index(fields=['drift_type', 'severity_score']),
             models.Index(fields=['resolved_at']),
+            # Organization-scoped listings and the summary aggregate
+            models.Index(
+                fields=['environment', 'resolved_at', 'severity_score'],
+                name='drift_env_res_sev_idx'
+            ),
+            # Open drifts are the common filter and a small share of rows
+            models.Index(
+                fields=['environment', '-detected_at'],
+                name='drift_unresolved_idx',
+                condition=models.Q(resolved_at__isnull=True)
+            ),
+            # Containment lookups on tags (tags__contains=...)
+            GinIndex(fields=['tags'], name='drift_tags_gin', opclasses=['jsonb_path_ops']),
         ]
 
     def __str__(self):
@@ -118,6 +132,9 @@ class DriftEvent(models.Model):
     @property
     def drift_changes_count(self):
         """Count of specific changes in this drift"""
+        # Annotated by DriftEventViewSet.get_queryset
+        if hasattr(self, '_changes_count'):
+            return self._changes_count
         return self.changes.count()
 
     def get_top_changes(self, limit=5):
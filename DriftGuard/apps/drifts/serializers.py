@@ -34,7 +34,7 @@ class RecommendationSummarySerializer(serializers.Serializer):
 class DriftChangeSerializer(serializers.ModelSerializer):
     """Serializer for DriftChange model"""
 
-    value_diff = serializers.SerializerMethodField(read_only=True)
+    value_diff = serializers.CharField(source='get_value_diff', read_only=True)
 
     class Meta:
         model = DriftChange
@@ -45,10 +45,6 @@ class DriftChangeSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'created_at', 'value_diff']
 
-    def get_value_diff(self, obj):
-        """Get formatted value difference"""
-        return obj.get_value_diff()
-
 
 class DriftEventSerializer(serializers.ModelSerializer):
     """Serializer for DriftEvent model"""
@@ -64,7 +60,7 @@ class DriftEventSerializer(serializers.ModelSerializer):
     changes_count = serializers.SerializerMethodField(read_only=True)
     changes = DriftChangeSerializer(many=True, read_only=True)
     cause_analysis = serializers.SerializerMethodField(read_only=True)
-    recommendations = RecommendationSummarySerializer(many=True, read_only=True)
+    recommendations = serializers.SerializerMethodField(read_only=True)
 
     class Meta:
         model = DriftEvent
@@ -85,15 +81,21 @@ class DriftEventSerializer(serializers.ModelSerializer):
 
     def get_changes_count(self, obj):
         """Get count of changes in this drift"""
-        return obj.changes.count()
+        return obj.drift_changes_count
 
     def get_cause_analysis(self, obj):
         """Get cause analysis if available"""
-        if hasattr(obj, 'cause_analysis'):
-            return DriftCauseAnalysisSerializer(obj.cause_analysis).data
+        # select_related by DriftEventViewSet, so a missing analysis is
+        # cached as None rather than queried for
+        cause_analysis = getattr(obj, 'cause_analysis', None)
+        if cause_analysis is not None:
+            return DriftCauseAnalysisSerializer(cause_analysis).data
         return None
 
     def get_recommendations(self, obj):
         """Get recommendations for this drift"""
-        recommendations = obj.recommendations.filter(is_active=True)
+        # Prefetched by DriftEventViewSet; mirrors Recommendation.is_active()
+        recommendations = getattr(obj, 'active_recommendations', None)
+        if recommendations is None:
+            recommendations = obj.recommendations.filter(is_expired=False, is_implemented=False)
         return RecommendationSummarySerializer(recommendations, many=True).data
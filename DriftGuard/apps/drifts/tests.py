@@ -0,0 +1,62 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from apps.core.testing import LOCMEM_CACHES, create_resource_graph
+from apps.organizations.models import Organization
+from .models import DriftEvent
+
+User = get_user_model()
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class DriftAnalyzeTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        graph = create_resource_graph()
+        cls.user = graph.user
+        other = Organization.objects.create(name='Other', slug='other')
+        cls.outsider = User.objects.create_user(
+            username='outsider', password='pw', organization=other, role='editor'
+        )
+        cls.drift = DriftEvent.objects.create(
+            environment=graph.environment, iac_resource=graph.resource, drift_type='modified',
+            actual_state={}, declared_state={}, severity_score=0.5
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+
+    @mock.patch('apps.ml.tasks.analyze_drift_task.delay')
+    def test_analyze_queues_the_task(self, delay):
+        delay.return_value = mock.Mock(id='task-1')
+        self.client.force_authenticate(self.user)
+
+        response = self.client.post(
+            f'/api/v1/drifts/{self.drift.pk}/analyze/', {'context': {'ticket': 'OPS-1'}}, format='json'
+        )
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data['status'], 'queued')
+        self.assertEqual(response.data['task_id'], 'task-1')
+        delay.assert_called_once_with(self.drift.pk, {'ticket': 'OPS-1'})
+
+    @mock.patch('apps.ml.tasks.analyze_drift_task.delay')
+    def test_analyze_is_scoped_to_the_organization(self, delay):
+        self.client.force_authenticate(self.outsider)
+
+        response = self.client.post(f'/api/v1/drifts/{self.drift.pk}/analyze/')
+
+        self.assertEqual(response.status_code, 404)
+        delay.assert_not_called()
+
+    def test_analysis_is_pending_until_the_task_completes(self):
+        self.client.force_authenticate(self.user)
+
+        response = self.client.get(f'/api/v1/drifts/{self.drift.pk}/analysis/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {'status': 'pending'})
@@ -1,103 +1,154 @@
 from django.utils import timezone
 from django.db import models
 
+from django_auto_prefetching import AutoPrefetchViewSetMixin
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 
+from apps.core.pagination import DriftEventCursorPagination
 from apps.core.permissions import RoleBasedPermission
+from apps.recommendations.models import Recommendation
 from .models import DriftEvent
-from .serializers import DriftEventSerializer
+from .serializers import DriftCauseAnalysisSerializer, DriftEventSerializer
 
 
-class DriftEventViewSet(viewsets.ModelViewSet):
+class DriftEventViewSet(AutoPrefetchViewSetMixin, viewsets.ModelViewSet):
     """
     ViewSet for drift event management
     """
 
     serializer_class = DriftEventSerializer
     permission_classes = [RoleBasedPermission]
+    pagination_class = DriftEventCursorPagination
     filterset_fields = ['drift_type', 'resolved_at', 'severity_score']
     ordering_fields = ['detected_at', 'severity_score', '-created_at']
     ordering = ['-detected_at']
 
     def get_queryset(self):
+        if self.action == 'analyze':
+            # analyze only checks the organization and whether an analysis
+            # exists; skip the JSON state columns and serializer relations
+            return self.scope_to_user(DriftEvent.objects.select_related(
+                'environment', 'cause_analysis'
+            ).only('id', 'environment__organization', 'cause_analysis__id'))
+        if self.action == 'analysis':
+            return self.scope_to_user(
+                DriftEvent.objects.select_related('cause_analysis').only('id', 'cause_analysis')
+            )
+        return super().get_queryset()
+
+    def get_prefetchable_queryset(self):
         """Filter drift events based on user organization"""
+        # Relations rendered by declared serializer fields are added by
+        # AutoPrefetchViewSetMixin; method fields need explicit hints
+        return self.scope_to_user(DriftEvent.objects.select_related(
+            'cause_analysis'
+        ).prefetch_related(
+            models.Prefetch(
+                'recommendations',
+                queryset=Recommendation.objects.filter(is_expired=False, is_implemented=False),
+                to_attr='active_recommendations'
+            ),
+        ).annotate(_changes_count=models.Count('changes')))
+
+    def scope_to_user(self, queryset):
+        """Restrict a drift event queryset to what the requesting user may see"""
         user = self.request.user
-        queryset = DriftEvent.objects.select_related('environment', 'iac_resource')
 
         # Admin users can see all drift events
         if user.role == 'admin' or user.is_superuser:
             return queryset
 
         # Regular users see only drift events in their organization's environments
-        if hasattr(user, 'organization'):
+        if user.organization_id is not None:
             return queryset.filter(
-                environment__organization=user.organization,
+                environment__organization_id=user.organization_id,
                 environment__is_active=True
             )
 
         # Fallback: return empty queryset
         return queryset.none()
 
+    def _check_org(self, drift_event, request, verb):
+        """Return a 403 response if the user may not act on the drift event, else None"""
+        user = request.user
+        if user.role == 'admin' or user.is_superuser:
+            return None
+
+        # Compare keys so neither organization row has to be loaded
+        if drift_event.environment.organization_id != user.organization_id:
+            return Response(
+                {'error': f'Cannot {verb} drift in another organization'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        return None
+
     @action(detail=True, methods=['post'], permission_classes=[IsAuthenticated])
     def analyze(self, request, pk=None):
         """Trigger AI analysis for drift event"""
         drift_event = self.get_object()
 
         # Check permissions
-        if drift_event.environment.organization != request.user.organization and \
-           not (request.user.role == 'admin' or request.user.is_superuser):
-            return Response(
-                {'error': 'Cannot analyze drift in another organization'},
-                status=status.HTTP_403_FORBIDDEN
-            )
+        denied = self._check_org(drift_event, request, 'analyze')
+        if denied is not None:
+            return denied
 
         # Check if already analyzed
-        if hasattr(drift_event, 'cause_analysis'):
+        if getattr(drift_event, 'cause_analysis', None) is not None:
             return Response(
                 {'error': 'Drift already analyzed'},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
         try:
-            # Trigger async analysis
             from apps.ml.tasks import analyze_drift_task
 
-            # For now, run synchronously for simplicity
-            result = analyze_drift_task(drift_event.id, request.data.get('context', {}))
+            # Run the analysis on a worker; clients poll the analysis endpoint
+            task = analyze_drift_task.delay(drift_event.id, request.data.get('context', {}))
 
             return Response({
-                'status': 'completed',
-                'result': result,
-                'analyzed_at': timezone.now()
-            })
+                'status': 'queued',
+                'task_id': task.id,
+                'queued_at': timezone.now()
+            }, status=status.HTTP_202_ACCEPTED)
 
         except Exception as e:
             return Response(
-                {'error': f'Analysis failed: {str(e)}'},
+                {'error': f'Failed to queue analysis: {str(e)}'},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+    @action(detail=True, methods=['get'], permission_classes=[IsAuthenticated])
+    def analysis(self, request, pk=None):
+        """Get the cause analysis for a drift event once it has completed"""
+        drift_event = self.get_object()
+
+        cause_analysis = getattr(drift_event, 'cause_analysis', None)
+        if cause_analysis is None:
+            return Response({'status': 'pending'})
+
+        return Response({
+            'status': 'completed',
+            'cause_analysis': DriftCauseAnalysisSerializer(cause_analysis).data
+        })
+
     @action(detail=True, methods=['post'], permission_classes=[IsAuthenticated])
     def resolve(self, request, pk=None):
         """Resolve a drift event"""
         drift_event = self.get_object()
 
         # Check permissions
-        if drift_event.environment.organization != request.user.organization and \
-           not (request.user.role == 'admin' or request.user.is_superuser):
-            from rest_framework import status
-            return Response(
-                {'error': 'Cannot resolve drift in another organization'},
-                status=status.HTTP_403_FORBIDDEN
-            )
+        denied = self._check_org(drift_event, request, 'resolve')
+        if denied is not None:
+            return denied
 
         drift_event.resolved_at = timezone.now()
         drift_event.resolution_type = request.data.get('resolution_type', 'accepted')
         drift_event.resolution_notes = request.data.get('resolution_notes', '')
-        drift_event.save()
+        # Leave the JSON state columns out of the UPDATE
+        drift_event.save(update_fields=['resolved_at', 'resolution_type', 'resolution_notes', 'updated_at'])
 
         serializer = self.get_serializer(drift_event)
         return Response(serializer.data)
@@ -105,14 +156,20 @@ class DriftEventViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
     def summary(self, request):
         """Get drift summary for user's organization"""
-        user = self.request.user
-        queryset = self.get_queryset()
-
-        # Aggregate data
-        total_drifts = queryset.count()
-        resolved_drifts = queryset.filter(resolved_at__isnull=False).count()
+        # Plain scoped queryset: the list prefetches and annotations would
+        # only slow the aggregate down
+        queryset = self.scope_to_user(DriftEvent.objects.all())
+
+        # Aggregate data in a single query
+        stats = queryset.aggregate(
+            total=models.Count('id'),
+            resolved=models.Count('id', filter=models.Q(resolved_at__isnull=False)),
+            avg=models.Avg('severity_score')
+        )
+        total_drifts = stats['total']
+        resolved_drifts = stats['resolved']
         unresolved_drifts = total_drifts - resolved_drifts
-        avg_severity = queryset.aggregate(avg=models.Avg('severity_score'))['avg'] or 0
+        avg_severity = stats['avg'] or 0
 
         return Response({
             'total_drifts': total_drifts,
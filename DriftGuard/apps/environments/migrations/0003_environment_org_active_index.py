@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-15 17:54
+
+from django.db import migrations, models
+
+from apps.core.operations import AddIndexConcurrentlyIfPostgres
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('environments', '0002_cloudcredential'),
+        ('organizations', '0001_initial'),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyIfPostgres(
+            model_name='environment',
+            index=models.Index(fields=['organization', 'is_active'], name='env_org_active_idx'),
+        ),
+    ]
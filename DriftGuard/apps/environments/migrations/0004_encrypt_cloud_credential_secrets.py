@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-15 17:57
+
+import apps.core.fields
+from django.db import migrations
+
+SECRET_FIELDS = ['aws_secret_access_key', 'azure_client_secret', 'gcp_service_account_key']
+
+
+def encrypt_secrets(apps, schema_editor):
+    # Existing plaintext is read back unchanged and encrypted on save
+    CloudCredential = apps.get_model('environments', 'CloudCredential')
+    for credential in CloudCredential.objects.using(schema_editor.connection.alias).iterator():
+        credential.save(update_fields=SECRET_FIELDS)
+
+
+def decrypt_secrets(apps, schema_editor):
+    # Saving through the model would encrypt again, so write plaintext directly
+    CloudCredential = apps.get_model('environments', 'CloudCredential')
+    connection = schema_editor.connection
+    qn = connection.ops.quote_name
+    assignments = ', '.join(f'{qn(name)} = %s' for name in SECRET_FIELDS)
+    sql = f'UPDATE {qn(CloudCredential._meta.db_table)} SET {assignments} WHERE {qn("id")} = %s'
+
+    with connection.cursor() as cursor:
+        for credential in CloudCredential.objects.using(connection.alias).iterator():
+            cursor.execute(sql, [getattr(credential, name) for name in SECRET_FIELDS] + [credential.pk])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('environments', '0003_environment_org_active_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='cloudcredential',
+            name='aws_secret_access_key',
+            field=apps.core.fields.EncryptedTextField(blank=True, max_length=128, null=True),
+        ),
+        migrations.AlterField(
+            model_name='cloudcredential',
+            name='azure_client_secret',
+            field=apps.core.fields.EncryptedTextField(blank=True, max_length=128, null=True),
+        ),
+        migrations.AlterField(
+            model_name='cloudcredential',
+            name='gcp_service_account_key',
+            field=apps.core.fields.EncryptedTextField(blank=True, help_text='GCP Service Account JSON key', null=True),
+        ),
+        migrations.RunPython(encrypt_secrets, decrypt_secrets),
+    ]
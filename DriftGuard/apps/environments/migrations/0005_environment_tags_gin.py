@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-15 17:58
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+from apps.core.operations import AddPostgresIndexConcurrently
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('environments', '0004_encrypt_cloud_credential_secrets'),
+        ('organizations', '0001_initial'),
+    ]
+
+    operations = [
+        AddPostgresIndexConcurrently(
+            model_name='environment',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['tags'], name='env_tags_gin', opclasses=['jsonb_path_ops']),
+        ),
+    ]
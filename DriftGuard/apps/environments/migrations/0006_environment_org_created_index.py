@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-15 18:07
+
+from django.db import migrations, models
+
+from apps.core.operations import AddIndexConcurrentlyIfPostgres
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('environments', '0005_environment_tags_gin'),
+        ('organizations', '0001_initial'),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyIfPostgres(
+            model_name='environment',
+            index=models.Index(fields=['organization', '-created_at'], name='env_org_created_idx'),
+        ),
+    ]
@@ -1,8 +1,18 @@
+import re
+
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
+from django.db.models import ExpressionWrapper, Q
 from django.core.validators import RegexValidator
+from django.utils.functional import cached_property
+from apps.core.fields import EncryptedTextField
 from apps.organizations.models import Organization
 
 
+# Basic AWS region validation: us-east-1, us-gov-west-1, eu-central-1, ...
+_AWS_REGION_RE = re.compile(r'^(?:(?:us|eu|ap|ca)-[a-z]+(?:-[a-z]+)?-\d+|sa-east-1)$')
+
+
 class Environment(models.Model):
     """Environment model representing cloud environments (AWS, GCP, Azure)"""
 
@@ -52,6 +62,11 @@ class Environment(models.Model):
         indexes = [
             models.Index(fields=['organization', 'cloud_provider']),
             models.Index(fields=['is_active']),
+            models.Index(fields=['organization', 'is_active'], name='env_org_active_idx'),
+            # The list's cursor pagination walks created_at within an organization
+            models.Index(fields=['organization', '-created_at'], name='env_org_created_idx'),
+            # Containment lookups on tags (tags__contains=...)
+            GinIndex(fields=['tags'], name='env_tags_gin', opclasses=['jsonb_path_ops']),
         ]
 
     def __str__(self):
@@ -62,16 +77,12 @@ class Environment(models.Model):
         from django.core.exceptions import ValidationError
 
         # Validate region based on cloud provider
-        if self.cloud_provider == 'aws' and not self.region.startswith('us-'):
-            # Basic AWS region validation
-            if not any(region in self.region.lower() for region in [
-                'us-east-', 'us-west-', 'eu-', 'ap-', 'ca-', 'sa-east-1'
-            ]):
-                raise ValidationError('Invalid AWS region format')
+        if self.cloud_provider == 'aws' and not _AWS_REGION_RE.match(self.region.lower()):
+            raise ValidationError('Invalid AWS region format')
 
     def get_cloud_provider_display(self):
         """Get human-readable cloud provider name"""
-        return dict(self.CLOUD_PROVIDERS)[self.cloud_provider]
+        return _CLOUD_PROVIDER_NAMES[self.cloud_provider]
 
     @property
     def is_ready_for_scan(self):
@@ -83,18 +94,36 @@ class Environment(models.Model):
         )
 
     @property
-    def resource_count(self):
-        """Get count of IaC resources in this environment"""
-        return self.iac_repositories.aggregate(
-            total_resources=models.Count('resources')
-        )['total_resources'] or 0
+    def organization_resource_count(self):
+        """
+        Get count of IaC resources across the organization's repositories
+
+        IaC resources are not tied to an environment, so this is the same for
+        every environment of an organization.
+        """
+        # Annotated by EnvironmentViewSet.get_queryset
+        if hasattr(self, '_organization_resource_count'):
+            return self._organization_resource_count
+
+        from apps.iac.models import IaCResource
+        return IaCResource.objects.filter(
+            iac_file__repository__organization_id=self.organization_id
+        ).count()
 
     @property
     def drift_count(self):
         """Get count of unresolved drifts in this environment"""
+        # Annotated by EnvironmentViewSet.get_queryset
+        if hasattr(self, '_drift_count'):
+            return self._drift_count
         return self.drifts.filter(resolved_at__isnull=True).count()
 
 
+# Built once rather than per call; the environment list serializes the
+# display name for every row
+_CLOUD_PROVIDER_NAMES = dict(Environment.CLOUD_PROVIDERS)
+
+
 class CloudCredential(models.Model):
     """Encrypted cloud provider credentials for accessing environments"""
 
@@ -116,16 +145,16 @@ class CloudCredential(models.Model):
 
     # AWS Credentials
     aws_access_key_id = models.CharField(max_length=128, blank=True, null=True)
-    aws_secret_access_key = models.CharField(max_length=128, blank=True, null=True)  # Will be encrypted
+    aws_secret_access_key = EncryptedTextField(max_length=128, blank=True, null=True)
     aws_role_arn = models.CharField(max_length=200, blank=True, null=True)
 
     # Azure Credentials
     azure_client_id = models.CharField(max_length=128, blank=True, null=True)
-    azure_client_secret = models.CharField(max_length=128, blank=True, null=True)  # Encrypted
+    azure_client_secret = EncryptedTextField(max_length=128, blank=True, null=True)
     azure_tenant_id = models.CharField(max_length=128, blank=True, null=True)
 
     # GCP Credentials
-    gcp_service_account_key = models.TextField(blank=True, null=True, help_text="GCP Service Account JSON key")  # Encrypted
+    gcp_service_account_key = EncryptedTextField(blank=True, null=True, help_text="GCP Service Account JSON key")
 
     # Metadata
     is_active = models.BooleanField(default=True)
@@ -133,48 +162,87 @@ class CloudCredential(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    SECRET_FIELDS = ('aws_secret_access_key', 'azure_client_secret', 'gcp_service_account_key')
+
     class Meta:
         ordering = ['-updated_at']
 
     def __str__(self):
         return f"{self.environment.name} ({self.get_credential_type_display()})"
 
+    @property
+    def organization_id(self):
+        """Organization of the credential's environment, checked by OrganizationPermission"""
+        return self.environment.organization_id
+
     def clean(self):
         """Validate credential configuration based on type"""
         from django.core.exceptions import ValidationError
 
+        error = self.get_configuration_error()
+        if error:
+            raise ValidationError(error)
+
+    def get_configuration_error(self):
+        """Return why the credentials are unusable, or None if they are configured"""
         provider = self.environment.cloud_provider
 
         if self.credential_type.startswith('aws_'):
             if provider != 'aws':
-                raise ValidationError('AWS credentials can only be used with AWS environments')
+                return 'AWS credentials can only be used with AWS environments'
 
             if self.credential_type == 'aws_access_keys':
-                if not self.aws_access_key_id or not self.aws_secret_access_key:
-                    raise ValidationError('AWS Access Key ID and Secret Access Key are required')
+                if not self.aws_access_key_id or not self._secret_is_set('aws_secret_access_key'):
+                    return 'AWS Access Key ID and Secret Access Key are required'
             elif self.credential_type == 'aws_role':
                 if not self.aws_role_arn:
-                    raise ValidationError('AWS Role ARN is required for role-based authentication')
+                    return 'AWS Role ARN is required for role-based authentication'
 
         elif self.credential_type.startswith('azure_'):
             if provider != 'azure':
-                raise ValidationError('Azure credentials can only be used with Azure environments')
+                return 'Azure credentials can only be used with Azure environments'
 
             if self.credential_type == 'azure_service_principal':
-                if not all([self.azure_client_id, self.azure_client_secret, self.azure_tenant_id]):
-                    raise ValidationError('Azure Client ID, Secret, and Tenant ID are required')
+                if not all([self.azure_client_id, self._secret_is_set('azure_client_secret'), self.azure_tenant_id]):
+                    return 'Azure Client ID, Secret, and Tenant ID are required'
 
         elif self.credential_type.startswith('gcp_'):
             if provider != 'gcp':
-                raise ValidationError('GCP credentials can only be used with GCP environments')
+                return 'GCP credentials can only be used with GCP environments'
 
             if self.credential_type == 'gcp_service_account':
-                if not self.gcp_service_account_key:
-                    raise ValidationError('GCP Service Account Key is required')
+                if not self._secret_is_set('gcp_service_account_key'):
+                    return 'GCP Service Account Key is required'
+
+        return None
+
+    @classmethod
+    def defer_secrets(cls, queryset):
+        """
+        Defer the encrypted secret columns, annotating only whether each is set
+
+        Enough for is_configured without fetching or decrypting the secrets.
+        """
+        return queryset.defer(*cls.SECRET_FIELDS).annotate(**{
+            f'_has_{name}': ExpressionWrapper(
+                Q(**{f'{name}__isnull': False}) & ~Q(**{name: ''}),
+                output_field=models.BooleanField()
+            )
+            for name in cls.SECRET_FIELDS
+        })
+
+    def _secret_is_set(self, name):
+        if name in self.__dict__ or not hasattr(self, f'_has_{name}'):
+            return bool(getattr(self, name))
+        return getattr(self, f'_has_{name}')
+
+    def get_credential_type_display(self):
+        """Get human-readable credential type name"""
+        return _CREDENTIAL_TYPE_NAMES.get(self.credential_type, self.credential_type)
 
     def get_credentials_dict(self):
         """Return credentials as dictionary for API calls"""
-        # Note: In production this would decrypt encrypted fields
+        # Secret fields are decrypted by EncryptedTextField when loaded
         creds = {}
 
         if self.credential_type == 'aws_access_keys':
@@ -195,11 +263,13 @@ class CloudCredential(models.Model):
 
         return creds
 
-    @property
+    @cached_property
     def is_configured(self):
         """Check if credentials are properly configured"""
-        try:
-            self.full_clean()
-            return True
-        except:
-            return False
+        # Only the type-specific checks from clean(); running full_clean()
+        # per credential made serializing environment lists expensive
+        return self.get_configuration_error() is None
+
+
+# Built once rather than per call, as _CLOUD_PROVIDER_NAMES
+_CREDENTIAL_TYPE_NAMES = dict(CloudCredential.CREDENTIAL_TYPES)
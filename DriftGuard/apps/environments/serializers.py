@@ -1,11 +1,29 @@
+import copy
+
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError as DjangoValidationError
+
+from apps.core.serializers import CachedFieldsMixin
 from .models import Environment, CloudCredential
 
 User = get_user_model()
 
 
-class CloudCredentialSerializer(serializers.ModelSerializer):
+def validate_model_clean(serializer, model_class, attrs):
+    """Run model_class.clean() against the serializer's validated attrs"""
+    instance = copy.copy(serializer.instance) if serializer.instance else model_class()
+    for name, value in attrs.items():
+        setattr(instance, name, value)
+
+    try:
+        instance.clean()
+    except DjangoValidationError as e:
+        raise serializers.ValidationError(e.messages)
+    return attrs
+
+
+class CloudCredentialSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Serializer for cloud credentials"""
     credential_type_display = serializers.CharField(source='get_credential_type_display', read_only=True)
     is_configured = serializers.BooleanField(read_only=True)
@@ -29,7 +47,7 @@ class CloudCredentialSerializer(serializers.ModelSerializer):
         }
 
 
-class CloudCredentialCreateSerializer(serializers.ModelSerializer):
+class CloudCredentialCreateSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Serializer for creating cloud credentials with input validation"""
 
     class Meta:
@@ -41,18 +59,17 @@ class CloudCredentialCreateSerializer(serializers.ModelSerializer):
             'gcp_service_account_key'
         ]
 
-    def create(self, validated_data):
-        creds = CloudCredential.objects.create(**validated_data)
-        # Validate credentials by calling full_clean
-        creds.full_clean()
-        return creds
+    def validate(self, attrs):
+        # Field validators already ran; only the model's cross-field checks
+        # remain, and they must pass before anything is written
+        return validate_model_clean(self, CloudCredential, attrs)
 
 
-class EnvironmentSerializer(serializers.ModelSerializer):
+class EnvironmentSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Serializer for Environment model"""
     organization_name = serializers.CharField(source='organization.name', read_only=True)
     cloud_provider_display = serializers.CharField(source='get_cloud_provider_display', read_only=True)
-    resource_count = serializers.IntegerField(read_only=True)
+    organization_resource_count = serializers.IntegerField(read_only=True)
     drift_count = serializers.IntegerField(read_only=True)
     is_ready_for_scan = serializers.BooleanField(read_only=True)
     has_credentials = serializers.SerializerMethodField()
@@ -63,20 +80,22 @@ class EnvironmentSerializer(serializers.ModelSerializer):
             'id', 'organization', 'organization_name', 'name', 'slug',
             'cloud_provider', 'cloud_provider_display', 'region', 'account_id',
             'tags', 'is_active', 'created_at', 'updated_at',
-            'resource_count', 'drift_count', 'is_ready_for_scan', 'has_credentials'
+            'organization_resource_count', 'drift_count', 'is_ready_for_scan', 'has_credentials'
         ]
         read_only_fields = [
-            'id', 'created_at', 'updated_at', 'resource_count',
+            'id', 'created_at', 'updated_at', 'organization_resource_count',
             'drift_count', 'is_ready_for_scan', 'organization_name',
             'cloud_provider_display', 'has_credentials'
         ]
 
     def get_has_credentials(self, obj):
         """Check if environment has configured credentials"""
-        return hasattr(obj, 'credentials') and obj.credentials.is_configured
+        # credentials is select_related by EnvironmentViewSet
+        credentials = getattr(obj, 'credentials', None)
+        return credentials is not None and credentials.is_configured
 
 
-class EnvironmentCreateSerializer(serializers.ModelSerializer):
+class EnvironmentCreateSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Serializer for creating environments"""
 
     class Meta:
@@ -86,8 +105,7 @@ class EnvironmentCreateSerializer(serializers.ModelSerializer):
             'region', 'account_id', 'tags'
         ]
 
-    def create(self, validated_data):
-        env = Environment.objects.create(**validated_data)
-        # Validate by calling full_clean
-        env.full_clean()
-        return env
+    def validate(self, attrs):
+        # Field validators already ran; only the model's cross-field checks
+        # remain, and they must pass before anything is written
+        return validate_model_clean(self, Environment, attrs)
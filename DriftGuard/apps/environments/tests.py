@@ -0,0 +1,69 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from apps.core.testing import LOCMEM_CACHES, create_iac_file
+from apps.iac.models import IaCResource
+from apps.organizations.models import Organization
+from .models import CloudCredential, Environment
+
+User = get_user_model()
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class EnvironmentListTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        organization = Organization.objects.create(name='Acme', slug='acme')
+        cls.user = User.objects.create_user(
+            username='editor', password='pw', organization=organization, role='editor'
+        )
+        cls.configured = Environment.objects.create(
+            organization=organization, name='Prod', slug='prod', cloud_provider='aws',
+            region='us-east-1', account_id='123456789012', tags={'team': 'web'}
+        )
+        CloudCredential.objects.create(
+            environment=cls.configured, credential_type='aws_access_keys', name='deploy',
+            aws_access_key_id='AKIA', aws_secret_access_key='s3cr3t'
+        )
+        cls.bare = Environment.objects.create(
+            organization=organization, name='Dev', slug='dev', cloud_provider='gcp'
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_list_items_match_the_detail_representation(self):
+        listed = {item['id']: item for item in self.client.get('/api/v1/environments/').data['results']}
+
+        for environment in (self.configured, self.bare):
+            detail = self.client.get(f'/api/v1/environments/{environment.pk}/').data
+            self.assertEqual(listed[environment.pk], detail)
+
+        self.assertTrue(listed[self.configured.pk]['has_credentials'])
+        self.assertTrue(listed[self.configured.pk]['is_ready_for_scan'])
+        self.assertFalse(listed[self.bare.pk]['has_credentials'])
+
+    def test_list_prefetches_credentials_without_secrets(self):
+        # The page, then every listed environment's credentials at once
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/v1/environments/')
+
+        self.assertEqual(response.status_code, 200)
+        with mock.patch('apps.core.fields.decrypt_value') as decrypt_value:
+            self.client.get('/api/v1/environments/')
+        decrypt_value.assert_not_called()
+
+    def test_organization_resource_count_is_organization_wide(self):
+        iac_file = create_iac_file(self.configured.organization, self.user)
+        for resource_id in ('web', 'db'):
+            IaCResource.objects.create(iac_file=iac_file, resource_id=resource_id, resource_definition='{}')
+
+        listed = self.client.get('/api/v1/environments/').data['results']
+
+        self.assertEqual([item['organization_resource_count'] for item in listed], [2, 2])
+        self.assertEqual(self.bare.organization_resource_count, 2)
@@ -2,9 +2,17 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from django.db.models import Count, OuterRef, Prefetch, Subquery
+from django.db.models.functions import Coalesce
+from django_auto_prefetching import AutoPrefetchViewSetMixin
 from django_filters.rest_framework import DjangoFilterBackend
 
+from apps.core.caching import ConditionalListMixin
+from apps.core.filters import SkipUnusedFiltersMixin
+from apps.core.middleware import get_auth_context
 from apps.core.permissions import OrganizationPermission
+from apps.drifts.models import DriftEvent
+from apps.iac.models import IaCResource
 from .models import Environment, CloudCredential
 from .serializers import (
     EnvironmentSerializer,
@@ -14,11 +22,13 @@ from .serializers import (
 )
 
 
-class EnvironmentViewSet(viewsets.ModelViewSet):
+class EnvironmentViewSet(ConditionalListMixin, SkipUnusedFiltersMixin, AutoPrefetchViewSetMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing cloud environments
     """
     serializer_class = EnvironmentSerializer
+    # Read by the has_credentials method field, invisible to auto-prefetching
+    auto_prefetch_extra_select_fields = {'credentials'}
     permission_classes = [IsAuthenticated, OrganizationPermission]
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['organization', 'cloud_provider', 'is_active', 'region']
@@ -29,20 +39,54 @@ class EnvironmentViewSet(viewsets.ModelViewSet):
         return EnvironmentSerializer
 
     def get_queryset(self):
+        if self.action == 'list':
+            # The credentials are fetched in one extra query with their
+            # secrets deferred, so has_credentials neither loads nor
+            # decrypts them for every listed environment
+            return self.get_prefetchable_queryset().select_related('organization').prefetch_related(
+                Prefetch('credentials', queryset=CloudCredential.defer_secrets(CloudCredential.objects.all()))
+            )
+        return super().get_queryset()
+
+    def get_prefetchable_queryset(self):
         """Filter environments by user's organization"""
-        return Environment.objects.filter(organization=self.request.user.organization).select_related('organization')
+        organization_id = get_auth_context(self.request).organization_id
+
+        # IaC resources are scoped to the organization's repositories (as in
+        # perform_drift_detection). Every listed environment shares the
+        # organization, so this subquery is uncorrelated and runs once
+        resource_count = IaCResource.objects.filter(
+            iac_file__repository__organization_id=organization_id
+        ).order_by().values('iac_file__repository__organization').annotate(
+            total=Count('id')
+        ).values('total')
+
+        # Correlated count rather than a join, so there is no GROUP BY over
+        # environments and the partial index on open drifts is used
+        drift_count = DriftEvent.objects.filter(
+            environment=OuterRef('pk'), resolved_at__isnull=True
+        ).order_by().values('environment').annotate(
+            total=Count('id')
+        ).values('total')
+
+        return Environment.objects.filter(
+            organization_id=organization_id
+        ).annotate(
+            _organization_resource_count=Coalesce(Subquery(resource_count), 0),
+            _drift_count=Coalesce(Subquery(drift_count), 0),
+        )
 
     def perform_create(self, serializer):
         """Set organization to user's organization"""
-        serializer.save(organization=self.request.user.organization)
+        serializer.save(organization_id=get_auth_context(self.request).organization_id)
 
     @action(detail=True, methods=['post'])
     def credentials(self, request, pk=None):
         """Set credentials for an environment"""
         environment = self.get_object()
 
-        # Check if credentials already exist
-        existing_creds = CloudCredential.objects.filter(environment=environment).first()
+        # Check if credentials already exist; joined by get_queryset
+        existing_creds = getattr(environment, 'credentials', None)
         if existing_creds:
             serializer = CloudCredentialCreateSerializer(existing_creds, data=request.data, partial=True)
         else:
@@ -59,7 +103,8 @@ class EnvironmentViewSet(viewsets.ModelViewSet):
         """Get credentials for an environment"""
         environment = self.get_object()
         try:
-            credentials = CloudCredential.objects.get(environment=environment)
+            # Joined by get_queryset, a missing row is cached as well
+            credentials = environment.credentials
             serializer = CloudCredentialSerializer(credentials)
             return Response(serializer.data)
         except CloudCredential.DoesNotExist:
@@ -70,26 +115,23 @@ class EnvironmentViewSet(viewsets.ModelViewSet):
         """Trigger a drift scan for this environment"""
         environment = self.get_object()
 
-        # Check if environment has credentials
-        if not hasattr(environment, 'credentials') or not environment.credentials.is_configured:
+        # Check if environment has credentials; joined by get_queryset, so
+        # this needs no further query
+        credentials = getattr(environment, 'credentials', None)
+        if credentials is None or not credentials.is_active or not credentials.is_configured:
             return Response({
                 'error': 'Environment has no valid credentials configured'
             }, status=status.HTTP_400_BAD_REQUEST)
 
-        try:
-            # TODO: Implement actual cloud API scanning
-            # For now, return success with mock message
-            return Response({
-                'message': f'Drift scan initiated for {environment.name}',
-                'status': 'success'
-            })
-        except Exception as e:
-            return Response({
-                'error': f'Failed to scan environment: {str(e)}'
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        # TODO: Implement actual cloud API scanning
+        # For now, return success with mock message
+        return Response({
+            'message': f'Drift scan initiated for {environment.name}',
+            'status': 'success'
+        })
 
 
-class CloudCredentialViewSet(viewsets.ModelViewSet):
+class CloudCredentialViewSet(SkipUnusedFiltersMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing cloud credentials
     """
@@ -105,6 +147,7 @@ class CloudCredentialViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         """Filter credentials by user's organization through environment relationship"""
-        return CloudCredential.objects.filter(
-            environment__organization=self.request.user.organization
-        ).select_related('environment', 'environment__organization')
+        # Responses never include the secrets, so leave them in the database
+        return CloudCredential.defer_secrets(CloudCredential.objects.filter(
+            environment__organization_id=get_auth_context(self.request).organization_id
+        ).select_related('environment', 'environment__organization'))
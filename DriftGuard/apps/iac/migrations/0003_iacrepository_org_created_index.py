@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-15 18:07
+
+from django.conf import settings
+from django.db import migrations, models
+
+from apps.core.operations import AddIndexConcurrentlyIfPostgres
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('iac', '0002_iacfile_alter_iacrepository_options_and_more'),
+        ('organizations', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyIfPostgres(
+            model_name='iacrepository',
+            index=models.Index(fields=['organization', '-created_at'], name='iacrepo_org_created_idx'),
+        ),
+    ]
@@ -47,6 +47,10 @@ class IaCRepository(models.Model):
     class Meta:
         # unique_together = ['organization', 'repository_owner', 'repository_name']  # Commented out for migration
         ordering = ['-created_at']
+        indexes = [
+            # The list's cursor pagination walks created_at within an organization
+            models.Index(fields=['organization', '-created_at'], name='iacrepo_org_created_idx'),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.repository_owner}/{self.repository_name})"
@@ -1,11 +1,14 @@
 from rest_framework import serializers
+
+from apps.core.serializers import CachedFieldsMixin
 from .models import IaCRepository, IaCFile, IaCResource
 
 
-class IaCRepositorySerializer(serializers.ModelSerializer):
+class IaCRepositorySerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Serializer for IaC Repository model"""
 
-    repository_full_name = serializers.SerializerMethodField()
+    # Annotated by IaCRepositoryViewSet
+    repository_full_name = serializers.CharField(read_only=True)
     total_files = serializers.SerializerMethodField()
     total_resources = serializers.SerializerMethodField()
 
@@ -22,22 +25,33 @@ class IaCRepositorySerializer(serializers.ModelSerializer):
             'github_token': {'write_only': True}  # Hide token in responses
         }
 
-    def get_repository_full_name(self, obj):
-        return obj.get_full_repository_path()
-
     def get_total_files(self, obj):
+        # Annotated by IaCRepositoryViewSet
+        if hasattr(obj, '_total_files'):
+            return obj._total_files
         return obj.files.count()
 
     def get_total_resources(self, obj):
+        # Annotated by IaCRepositoryViewSet
+        if hasattr(obj, '_total_resources'):
+            return obj._total_resources
         return IaCResource.objects.filter(iac_file__repository=obj).count()
 
     def create(self, validated_data):
         # Set the user from request context
         validated_data['created_by'] = self.context['request'].user
-        return super().create(validated_data)
+        instance = super().create(validated_data)
+        instance.repository_full_name = instance.get_full_repository_path()
+        return instance
+
+    def update(self, instance, validated_data):
+        instance = super().update(instance, validated_data)
+        # Keep the annotated name in step with the saved owner and name
+        instance.repository_full_name = instance.get_full_repository_path()
+        return instance
 
 
-class IaCRepositoryCreateSerializer(serializers.ModelSerializer):
+class IaCRepositoryCreateSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Simplified serializer for creating repositories"""
 
     class Meta:
@@ -53,7 +67,7 @@ class IaCRepositoryCreateSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class IaCFileSerializer(serializers.ModelSerializer):
+class IaCFileSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Serializer for IaC File model"""
 
     class Meta:
@@ -61,7 +75,7 @@ class IaCFileSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 
-class IaCResourceSerializer(serializers.ModelSerializer):
+class IaCResourceSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Serializer for IaC Resource model"""
 
     repository_name = serializers.CharField(source='iac_file.repository.name', read_only=True)
@@ -74,3 +88,10 @@ class IaCResourceSerializer(serializers.ModelSerializer):
             'resource_definition', 'line_number', 'created_at', 'updated_at',
             'repository_name', 'file_name'
         ]
+
+
+class IaCResourceListSerializer(IaCResourceSerializer):
+    """Resource list entries, without the potentially large resource definition"""
+
+    class Meta(IaCResourceSerializer.Meta):
+        fields = [name for name in IaCResourceSerializer.Meta.fields if name != 'resource_definition']
@@ -3,8 +3,10 @@ from rest_framework.routers import DefaultRouter
 from . import views
 
 router = DefaultRouter()
-router.register(r'', views.IaCRepositoryViewSet, basename='repository')
+# Before the empty prefix, whose detail route would otherwise match
+# files/ and resources/ as repository ids
 router.register(r'files', views.IaCFileViewSet, basename='file')
 router.register(r'resources', views.IaCResourceViewSet, basename='resource')
+router.register(r'', views.IaCRepositoryViewSet, basename='repository')
 
 urlpatterns = router.urls
@@ -1,4 +1,107 @@
-def get_queryset(self):
+from rest_framework import viewsets
+from rest_framework.permissions import IsAuthenticated
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Concat
+from django_filters.rest_framework import DjangoFilterBackend
+
+from apps.core.caching import ConditionalListMixin
+from apps.core.filters import SkipUnusedFiltersMixin
+from apps.core.middleware import get_auth_context
+from apps.core.pagination import IaCFileCursorPagination
+from apps.core.permissions import OrganizationPermission
+from .models import IaCRepository, IaCFile, IaCResource
+from .serializers import (
+    IaCRepositorySerializer,
+    IaCRepositoryCreateSerializer,
+    IaCFileSerializer,
+    IaCResourceSerializer,
+    IaCResourceListSerializer
+)
+
+
+class IaCRepositoryViewSet(ConditionalListMixin, SkipUnusedFiltersMixin, viewsets.ModelViewSet):
+    """
+    ViewSet for managing IaC repositories
+    """
+    serializer_class = IaCRepositorySerializer
+    permission_classes = [IsAuthenticated, OrganizationPermission]
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ['platform', 'iac_type', 'is_active']
+
+    def get_serializer_class(self):
+        if self.action == 'create':
+            return IaCRepositoryCreateSerializer
+        return IaCRepositorySerializer
+
+    def get_queryset(self):
         """Filter repositories by user's organization"""
-        user_org_ids = [self.request.user.organization.id]
-        return IaCRepository.objects.filter(organization_id__in=user_org_ids).select_related('organization', 'created_by')
+        # Per-repository counts as subqueries: joining files and resources
+        # in one query would multiply rows before counting
+        total_files = IaCFile.objects.filter(
+            repository=OuterRef('pk')
+        ).order_by().values('repository').annotate(total=Count('id')).values('total')
+        total_resources = IaCResource.objects.filter(
+            iac_file__repository=OuterRef('pk')
+        ).order_by().values('iac_file__repository').annotate(total=Count('id')).values('total')
+
+        return IaCRepository.objects.filter(organization_id=get_auth_context(self.request).organization_id).select_related(
+            'organization', 'created_by'
+        ).annotate(
+            # Same as IaCRepository.get_full_repository_path()
+            repository_full_name=Concat('repository_owner', Value('/'), 'repository_name'),
+            _total_files=Coalesce(Subquery(total_files), 0),
+            _total_resources=Coalesce(Subquery(total_resources), 0),
+        )
+
+    def perform_create(self, serializer):
+        """Set organization to user's organization"""
+        serializer.save(organization_id=get_auth_context(self.request).organization_id)
+
+
+class IaCFileViewSet(SkipUnusedFiltersMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    ViewSet for browsing files scanned from IaC repositories
+    """
+    serializer_class = IaCFileSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = IaCFileCursorPagination
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ['repository', 'file_type']
+
+    def get_queryset(self):
+        """Filter files by user's organization through repository relationship"""
+        return IaCFile.objects.filter(
+            repository__organization_id=get_auth_context(self.request).organization_id
+        )
+
+
+class IaCResourceViewSet(SkipUnusedFiltersMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    ViewSet for browsing resources extracted from IaC files
+    """
+    serializer_class = IaCResourceSerializer
+    permission_classes = [IsAuthenticated]
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ['iac_file', 'resource_type', 'provider']
+
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return IaCResourceListSerializer
+        return IaCResourceSerializer
+
+    def get_queryset(self):
+        """Filter resources by user's organization through file relationship"""
+        # Just what the serializer renders; the joined file and repository
+        # rows are otherwise loaded in full, and lists leave out the
+        # resource definition
+        fields = [
+            'id', 'iac_file', 'resource_type', 'resource_id', 'provider',
+            'line_number', 'created_at', 'updated_at',
+            'iac_file__file_name', 'iac_file__repository__name'
+        ]
+        if self.action != 'list':
+            fields.append('resource_definition')
+
+        return IaCResource.objects.filter(
+            iac_file__repository__organization_id=get_auth_context(self.request).organization_id
+        ).select_related('iac_file__repository').only(*fields)
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-15 18:11
+
+from django.db import migrations
+
+from apps.core.operations import RemoveIndexConcurrentlyIfPostgres
+
+
+class Migration(migrations.Migration):
+
+    # DROP INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('ml', '0001_initial'),
+    ]
+
+    operations = [
+        RemoveIndexConcurrentlyIfPostgres(
+            model_name='mlperformancemetric',
+            name='ml_mlperfor_ml_mode_4103b6_idx',
+        ),
+    ]
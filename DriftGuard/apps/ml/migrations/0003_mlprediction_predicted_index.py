@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-15 18:11
+
+from django.db import migrations, models
+
+from apps.core.operations import AddIndexConcurrentlyIfPostgres
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('drifts', '0004_driftevent_tags_gin'),
+        ('ml', '0002_drop_duplicate_metric_index'),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyIfPostgres(
+            model_name='mlprediction',
+            index=models.Index(fields=['-predicted_at'], name='mlpred_predicted_idx'),
+        ),
+    ]
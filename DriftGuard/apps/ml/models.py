@@ -1,5 +1,10 @@
+import heapq
+
 from django.db import models
+from django.db.models import F, Window
+from django.db.models.functions import Lag
 from django.core.validators import MaxValueValidator, MinValueValidator
+from django.utils import timezone
 from apps.drifts.models import DriftEvent
 
 
@@ -96,12 +101,18 @@ class MLModel(models.Model):
             model_type=self.model_type,
             is_active=True
         ).exclude(pk=self.pk).update(is_active=False)
+
+        # Update just the activation columns rather than a full save(); the
+        # timestamp is taken here so the instance matches without a reload
+        now = timezone.now()
+        MLModel.objects.filter(pk=self.pk).update(is_active=True, deployed_at=now, updated_at=now)
         self.is_active = True
-        self.deployed_at = models.functions.Now()
-        self.save()
+        self.deployed_at = self.updated_at = now
 
     def get_active_model(self, model_type):
         """Get the currently active model for a given type"""
+        # Not cached: this is a single lookup on the (model_type, is_active)
+        # index, and activate() changes it with queryset updates
         return MLModel.objects.filter(
             model_type=model_type,
             is_active=True
@@ -162,6 +173,8 @@ class MLPrediction(models.Model):
             models.Index(fields=['drift_event', 'predicted_at']),
             models.Index(fields=['ml_model', 'predicted_at']),
             models.Index(fields=['confidence_score']),
+            # Unfiltered (admin) lists are cursor-paginated on -predicted_at
+            models.Index(fields=['-predicted_at'], name='mlpred_predicted_idx'),
         ]
 
     def __str__(self):
@@ -249,16 +262,13 @@ class DriftCauseAnalysis(models.Model):
 
     def get_primary_factors(self, limit=3):
         """Get the most important contributing factors"""
-        if not self.contributing_factors:
-            return []
-
-        # Sort by weight/importance (assuming factors have weight field)
-        sorted_factors = sorted(
-            self.contributing_factors,
-            key=lambda x: x.get('weight', 0),
-            reverse=True
+        # Top factors by weight/importance (assuming factors have weight
+        # field); same order as a full descending sort, without sorting it all
+        return heapq.nlargest(
+            limit,
+            self.contributing_factors or [],
+            key=lambda x: x.get('weight', 0)
         )
-        return sorted_factors[:limit]
 
     def get_evidence_summary(self):
         """Generate a summary of evidence supporting this analysis"""
@@ -349,24 +359,49 @@ class MLPerformanceMetric(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
+        # The unique index on (ml_model, evaluation_date) also serves
+        # previous-evaluation lookups, read backwards, and the per-model window
         unique_together = ['ml_model', 'evaluation_date']
         ordering = ['-evaluation_date']
         indexes = [
-            models.Index(fields=['ml_model', 'evaluation_date']),
             models.Index(fields=['accuracy']),
         ]
 
     def __str__(self):
         return f"{self.ml_model.name} performance on {self.evaluation_date}"
 
+    @classmethod
+    def with_previous_accuracy(cls, queryset=None):
+        """
+        Annotate each metric with the accuracy of its model's previous evaluation
+
+        has_performance_degraded() then needs no query per metric. The window
+        only sees rows left by the queryset's filters, so filter whole models
+        (ml_model, ml_model__...) rather than individual evaluations.
+        """
+        if queryset is None:
+            queryset = cls.objects.all()
+        return queryset.annotate(
+            _previous_accuracy=Window(
+                Lag('accuracy'),
+                partition_by=[F('ml_model')],
+                order_by=F('evaluation_date').asc()
+            )
+        )
+
     def has_performance_degraded(self, threshold=0.05):
         """Check if model performance has degraded compared to previous evaluation"""
-        previous = MLPerformanceMetric.objects.filter(
-            ml_model=self.ml_model,
-            evaluation_date__lt=self.evaluation_date
-        ).order_by('-evaluation_date').first()
-
-        if not previous or not (self.accuracy and previous.accuracy):
+        # Annotated by with_previous_accuracy
+        if hasattr(self, '_previous_accuracy'):
+            previous_accuracy = self._previous_accuracy
+        else:
+            previous = MLPerformanceMetric.objects.filter(
+                ml_model_id=self.ml_model_id,
+                evaluation_date__lt=self.evaluation_date
+            ).order_by('-evaluation_date').only('accuracy').first()
+            previous_accuracy = previous.accuracy if previous else None
+
+        if not (self.accuracy and previous_accuracy):
             return False
 
-        return (previous.accuracy - self.accuracy) > threshold
+        return (previous_accuracy - self.accuracy) > threshold
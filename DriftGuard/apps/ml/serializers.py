@@ -75,3 +75,49 @@ class MLPerformanceMetricSerializer(serializers.ModelSerializer):
             'model_drift_score', 'created_at'
         ]
         read_only_fields = ['id', 'created_at', 'ml_model_name']
+
+
+# List variants without the larger JSON fields, which list actions leave in
+# the database (see ListOmittedFieldsMixin); retrieve returns everything
+
+class MLModelListSerializer(MLModelSerializer):
+    """MLModel list entries"""
+
+    class Meta(MLModelSerializer.Meta):
+        fields = [
+            'id', 'name', 'version', 'model_type', 'framework', 'artifact_path',
+            'features', 'target_classes', 'metrics', 'accuracy', 'training_data_size',
+            'is_active', 'trained_at', 'deployed_at', 'created_at', 'updated_at'
+        ]
+
+
+class MLPredictionListSerializer(MLPredictionSerializer):
+    """MLPrediction list entries"""
+
+    class Meta(MLPredictionSerializer.Meta):
+        fields = [
+            'id', 'drift_event', 'drift_event_id', 'ml_model', 'ml_model_name',
+            'predicted_class', 'confidence_score', 'processing_time', 'predicted_at'
+        ]
+
+
+class DriftCauseAnalysisListSerializer(DriftCauseAnalysisSerializer):
+    """DriftCauseAnalysis list entries"""
+
+    class Meta(DriftCauseAnalysisSerializer.Meta):
+        fields = [
+            'id', 'drift_event', 'drift_event_id', 'cause_category', 'confidence_score',
+            'contributing_factors', 'temporal_context', 'user_attribution',
+            'natural_language_explanation', 'analyzed_by', 'analyzed_at'
+        ]
+
+
+class MLPerformanceMetricListSerializer(MLPerformanceMetricSerializer):
+    """MLPerformanceMetric list entries"""
+
+    class Meta(MLPerformanceMetricSerializer.Meta):
+        fields = [
+            'id', 'ml_model', 'ml_model_name', 'evaluation_date', 'training_data_size',
+            'training_time', 'accuracy', 'precision_macro', 'recall_macro', 'f1_score_macro',
+            'model_drift_score', 'created_at'
+        ]
@@ -0,0 +1,65 @@
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.core.testing import LOCMEM_CACHES, create_resource_graph
+from apps.drifts.models import DriftEvent
+from .models import MLModel, MLPrediction
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class MLPredictionListTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        graph = create_resource_graph(role='admin')
+        cls.admin = graph.user
+        drift_event = DriftEvent.objects.create(
+            environment=graph.environment, iac_resource=graph.resource, drift_type='modified', declared_state={}
+        )
+        ml_model = MLModel.objects.create(
+            name='cause', version='1', model_type='classification', framework='xgboost',
+            artifact_path='models/cause', features=[], trained_at=timezone.now()
+        )
+        MLPrediction.objects.bulk_create([
+            MLPrediction(drift_event=drift_event, ml_model=ml_model, prediction_result={})
+            for _ in range(3)
+        ])
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_paginated_list(self):
+        response = self.client.get('/api/v1/ml/predictions/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 3)
+
+
+class MLModelActivationTests(TestCase):
+
+    def _model(self, name):
+        return MLModel.objects.create(
+            name=name, version='1', model_type='classification', framework='xgboost',
+            artifact_path=f'models/{name}', features=[], trained_at=timezone.now()
+        )
+
+    def test_activate_switches_the_active_model(self):
+        first, second = self._model('first'), self._model('second')
+
+        first.activate()
+        self.assertEqual(first.get_active_model('classification'), first)
+
+        second.activate()
+        self.assertEqual(first.get_active_model('classification'), second)
+        first.refresh_from_db()
+        self.assertFalse(first.is_active)
+
+    def test_bulk_updates_are_seen_immediately(self):
+        model = self._model('first')
+        model.activate()
+
+        MLModel.objects.filter(pk=model.pk).update(is_active=False)
+
+        self.assertIsNone(model.get_active_model('classification'))
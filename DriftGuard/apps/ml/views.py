@@ -1,16 +1,28 @@
 from rest_framework import viewsets
 
+from apps.core.mixins import ListOmittedFieldsMixin
+from apps.core.pagination import MLPredictionCursorPagination
 from apps.core.permissions import RoleBasedPermission
 from .models import MLModel, MLPrediction, DriftCauseAnalysis, MLPerformanceMetric
-from .serializers import MLModelSerializer, MLPredictionSerializer, DriftCauseAnalysisSerializer, MLPerformanceMetricSerializer
-
-
-class MLModelViewSet(viewsets.ModelViewSet):
+from .serializers import (
+    MLModelSerializer,
+    MLModelListSerializer,
+    MLPredictionSerializer,
+    MLPredictionListSerializer,
+    DriftCauseAnalysisSerializer,
+    DriftCauseAnalysisListSerializer,
+    MLPerformanceMetricSerializer,
+    MLPerformanceMetricListSerializer
+)
+
+
+class MLModelViewSet(ListOmittedFieldsMixin, viewsets.ModelViewSet):
     """
     ViewSet for ML model management
     """
 
     serializer_class = MLModelSerializer
+    list_serializer_class = MLModelListSerializer
     permission_classes = [RoleBasedPermission]
     filterset_fields = ['model_type', 'framework', 'is_active']
     ordering_fields = ['-deployed_at', 'name']
@@ -26,34 +38,37 @@ class MLModelViewSet(viewsets.ModelViewSet):
             return MLModel.objects.filter(is_active=True)
 
 
-class MLPredictionViewSet(viewsets.ModelViewSet):
+class MLPredictionViewSet(ListOmittedFieldsMixin, viewsets.ModelViewSet):
     """
     ViewSet for ML predictions
     """
 
     serializer_class = MLPredictionSerializer
+    list_serializer_class = MLPredictionListSerializer
     permission_classes = [RoleBasedPermission]
+    pagination_class = MLPredictionCursorPagination
     filterset_fields = ['ml_model', 'predicted_class']
-    ordering = ['-created_at']
+    ordering = ['-predicted_at']
 
     def get_queryset(self):
         """Filter predictions based on user's organization drifts"""
         user = self.request.user
         if user.role == 'admin' or user.is_superuser:
-            return MLPrediction.objects.all().select_related('drift_event', 'ml_model')
+            return MLPrediction.objects.all().select_related('drift_event__environment', 'ml_model')
         else:
             return MLPrediction.objects.filter(
-                drift_event__environment__organization=user.organization,
+                drift_event__environment__organization_id=user.organization_id,
                 drift_event__environment__is_active=True
-            ).select_related('drift_event', 'ml_model')
+            ).select_related('drift_event__environment', 'ml_model')
 
 
-class DriftCauseAnalysisViewSet(viewsets.ModelViewSet):
+class DriftCauseAnalysisViewSet(ListOmittedFieldsMixin, viewsets.ModelViewSet):
     """
     ViewSet for drift cause analysis
     """
 
     serializer_class = DriftCauseAnalysisSerializer
+    list_serializer_class = DriftCauseAnalysisListSerializer
     permission_classes = [RoleBasedPermission]
     filterset_fields = ['cause_category']
     ordering_fields = ['-analyzed_at', 'confidence_score']
@@ -63,20 +78,21 @@ class DriftCauseAnalysisViewSet(viewsets.ModelViewSet):
         """Filter analyses based on user's organization drifts"""
         user = self.request.user
         if user.role == 'admin' or user.is_superuser:
-            return DriftCauseAnalysis.objects.all().select_related('drift_event')
+            return DriftCauseAnalysis.objects.all().select_related('drift_event__environment')
         else:
             return DriftCauseAnalysis.objects.filter(
-                drift_event__environment__organization=user.organization,
+                drift_event__environment__organization_id=user.organization_id,
                 drift_event__environment__is_active=True
-            ).select_related('drift_event')
+            ).select_related('drift_event__environment')
 
 
-class MLPerformanceMetricViewSet(viewsets.ModelViewSet):
+class MLPerformanceMetricViewSet(ListOmittedFieldsMixin, viewsets.ModelViewSet):
     """
     ViewSet for ML performance metrics
     """
 
     serializer_class = MLPerformanceMetricSerializer
+    list_serializer_class = MLPerformanceMetricListSerializer
     permission_classes = [RoleBasedPermission]
     filterset_fields = ['ml_model']
     ordering = ['-created_at']
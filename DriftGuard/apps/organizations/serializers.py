@@ -1,13 +1,34 @@
 from rest_framework import serializers
+from rest_framework.validators import UniqueValidator
 from django.contrib.auth import get_user_model
 
+from apps.core.serializers import CachedFieldsMixin
 from .models import Organization, OrganizationSettings
 
 User = get_user_model()
 
+# Read from the model once at import rather than per request
+ROLE_CHOICES = User._meta.get_field('role').choices
+_VALID_ROLES = frozenset(value for value, _ in ROLE_CHOICES)
 
-class OrganizationSerializer(serializers.ModelSerializer):
-    """Serializer for Organization model"""
+
+COUNT_FIELDS = ('users_count', 'environments_count')
+
+
+def includes_counts(request):
+    """Whether organization counts are wanted; clients opt out with ?exclude=counts"""
+    if request is None:
+        return True
+    return 'counts' not in request.query_params.get('exclude', '').split(',')
+
+
+class OrganizationSerializer(CachedFieldsMixin, serializers.ModelSerializer):
+    """
+    Serializer for Organization model
+
+    users_count and environments_count are left out when the request
+    passes ?exclude=counts.
+    """
 
     users_count = serializers.SerializerMethodField()
     environments_count = serializers.SerializerMethodField()
@@ -21,13 +42,26 @@ class OrganizationSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'created_at', 'updated_at', 'slug']
 
+    def get_fields(self):
+        fields = super().get_fields()
+        if not includes_counts(self.context.get('request')):
+            for name in COUNT_FIELDS:
+                del fields[name]
+        return fields
+
     def get_users_count(self, obj):
         """Count of users in organization"""
+        # Annotated by OrganizationViewSet
+        if hasattr(obj, '_users_count'):
+            return obj._users_count
         return obj.users.count()
 
     def get_environments_count(self, obj):
         """Count of environments in organization"""
-        return getattr(obj, 'environments', []).count()
+        # Annotated by OrganizationViewSet
+        if hasattr(obj, '_environments_count'):
+            return obj._environments_count
+        return obj.environments.count()
 
     def create(self, validated_data):
         # Generate slug from name if not provided
@@ -38,7 +72,7 @@ class OrganizationSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class OrganizationSettingsSerializer(serializers.ModelSerializer):
+class OrganizationSettingsSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Serializer for OrganizationSettings model"""
 
     organization_name = serializers.CharField(
@@ -64,10 +98,10 @@ class OrganizationSettingsSerializer(serializers.ModelSerializer):
         read_only_fields = ['organization', 'organization_name', 'created_at', 'updated_at']
 
 
-class OrganizationMemberSerializer(serializers.ModelSerializer):
+class OrganizationMemberSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Serializer for organization members (users)"""
 
-    organization_name = serializers.CharField(source='organization.name', read_only=True)
+    organization_name = serializers.SerializerMethodField()
     full_name = serializers.SerializerMethodField()
     is_active_display = serializers.CharField(source='is_active', read_only=True)
 
@@ -83,13 +117,21 @@ class OrganizationMemberSerializer(serializers.ModelSerializer):
             'is_active_display', 'organization_name', 'last_login', 'date_joined'
         ]
 
+    def get_organization_name(self, obj):
+        """Name of the member's organization"""
+        # Listing an organization's members passes the organization in
+        organization = self.context.get('organization')
+        if organization is not None:
+            return organization.name
+        return obj.organization.name
+
     def get_full_name(self, obj):
         """Return user's full name"""
         full_name = obj.get_full_name()
         return full_name if full_name else obj.username
 
 
-class OrganizationMemberUpdateSerializer(serializers.ModelSerializer):
+class OrganizationMemberUpdateSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Serializer for updating organization member roles/status"""
 
     class Meta:
@@ -99,17 +141,24 @@ class OrganizationMemberUpdateSerializer(serializers.ModelSerializer):
 
     def validate_role(self, value):
         """Ensure valid role values"""
-        valid_roles = [choice[0] for choice in User._meta.get_field('role').choices]
-        if value not in valid_roles:
+        if value not in _VALID_ROLES:
+            valid_roles = [choice[0] for choice in ROLE_CHOICES]
             raise serializers.ValidationError(f"Invalid role. Valid choices are: {valid_roles}")
         return value
 
+    def update(self, instance, validated_data):
+        # Write only the submitted columns rather than the whole user row
+        for name, value in validated_data.items():
+            setattr(instance, name, value)
+        instance.save(update_fields=list(validated_data))
+        return instance
+
 
 class OrganizationMemberInviteSerializer(serializers.Serializer):
     """Serializer for inviting new members to organization"""
 
     email = serializers.EmailField()
-    role = serializers.ChoiceField(choices=User._meta.get_field('role').choices, default='viewer')
+    role = serializers.ChoiceField(choices=ROLE_CHOICES, default='viewer')
     first_name = serializers.CharField(max_length=150, required=False)
     last_name = serializers.CharField(max_length=150, required=False)
 
@@ -128,18 +177,16 @@ class OrganizationRegistrationSerializer(serializers.ModelSerializer):
         model = Organization
         fields = ['name', 'slug', 'description', 'contact_email']
         read_only_fields = ['slug']
-
-    def validate_name(self, value):
-        """Ensure organization name is unique"""
-        if Organization.objects.filter(name=value).exists():
-            raise serializers.ValidationError("An organization with this name already exists.")
-        return value
-
-    def validate_slug(self, value):
-        """Ensure organization slug is unique"""
-        if Organization.objects.filter(slug=value).exists():
-            raise serializers.ValidationError("An organization with this slug already exists.")
-        return value
+        # name is unique on the model, so the field already has a
+        # UniqueValidator; only its message is replaced
+        extra_kwargs = {
+            'name': {
+                'validators': [UniqueValidator(
+                    queryset=Organization.objects.all(),
+                    message="An organization with this name already exists."
+                )]
+            }
+        }
 
     def create(self, validated_data):
         # Generate slug from name if not provided
@@ -149,8 +196,12 @@ class OrganizationRegistrationSerializer(serializers.ModelSerializer):
             slug = base_slug
             counter = 1
 
-            # Ensure unique slug
-            while Organization.objects.filter(slug=slug).exists():
+            # Ensure unique slug; every candidate shares the base slug, so
+            # fetch the taken ones in one query instead of probing each
+            taken = set(Organization.objects.filter(
+                slug__startswith=base_slug
+            ).values_list('slug', flat=True))
+            while slug in taken:
                 slug = f"{base_slug}-{counter}"
                 counter += 1
 
@@ -0,0 +1,38 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from apps.core.testing import LOCMEM_CACHES
+from .models import Organization
+
+User = get_user_model()
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class OrganizationCountsTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.organization = Organization.objects.create(name='Acme', slug='acme')
+        cls.user = User.objects.create_user(
+            username='viewer', password='pw', organization=cls.organization, role='viewer'
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = f'/api/v1/organizations/{self.organization.pk}/'
+
+    def test_counts_are_included_by_default(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['users_count'], 1)
+        self.assertEqual(response.data['environments_count'], 0)
+
+    def test_counts_can_be_excluded(self):
+        response = self.client.get(self.url, {'exclude': 'counts'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('users_count', response.data)
+        self.assertNotIn('environments_count', response.data)
@@ -1,3 +1,7 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from django.shortcuts import get_object_or_404
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
@@ -5,16 +9,63 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from apps.core.caching import get_list_version
+from apps.core.middleware import get_auth_context
 from apps.core.permissions import RoleBasedPermission
+from apps.drifts.models import DriftEvent
+from apps.environments.models import Environment
 from .models import Organization, OrganizationSettings
 from .serializers import (
     OrganizationSerializer, OrganizationSettingsSerializer,
     OrganizationMemberSerializer, OrganizationMemberInviteSerializer,
-    OrganizationMemberUpdateSerializer
+    OrganizationMemberUpdateSerializer, includes_counts
 )
 
+User = get_user_model()
 
-class OrganizationViewSet(viewsets.ModelViewSet):
+# Seconds organization stats are cached for
+ORGANIZATION_STATS_CACHE_TIMEOUT = 60
+
+# User columns read by OrganizationMemberSerializer, plus the organization
+# that saving a member checks
+MEMBER_FIELDS = (
+    'id', 'organization', 'username', 'email', 'first_name', 'last_name',
+    'role', 'is_active', 'last_login', 'date_joined'
+)
+
+
+def _organization_count(queryset, organization_path='organization'):
+    """Correlated count of queryset rows belonging to the outer organization"""
+    return Coalesce(Subquery(
+        queryset.filter(**{organization_path: OuterRef('pk')}).order_by().values(
+            organization_path
+        ).annotate(total=Count('id')).values('total')
+    ), 0)
+
+
+class OrganizationAccessMixin:
+    """Organization access checks shared by the organization views"""
+
+    def _user_has_access(self, organization):
+        """Check if the requesting user has access to organization"""
+        context = get_auth_context(self.request)
+        if context.is_admin:
+            return True
+
+        # Compare ids; the organization descriptor would load the row
+        return context.organization_id == organization.id
+
+    def _user_is_admin_for_organization(self, organization):
+        """Check if the requesting user is admin for the organization"""
+        if self.request.user.is_superuser:
+            return True
+
+        # Organization admin if they are admin role in that organization
+        context = get_auth_context(self.request)
+        return context.role == 'admin' and context.organization_id == organization.id
+
+
+class OrganizationViewSet(OrganizationAccessMixin, viewsets.ModelViewSet):
     """
     ViewSet for organization management
     """
@@ -26,22 +77,29 @@ class OrganizationViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         """Filter organizations based on user role"""
-        user = self.request.user
+        context = get_auth_context(self.request)
 
         # Admin users can see all organizations
-        if user.role == 'admin' or user.is_superuser:
-            return Organization.objects.all()
-
-        # Regular users see only their organization
-        if hasattr(user, 'organization'):
-            return Organization.objects.filter(id=user.organization.id)
+        if context.is_admin:
+            queryset = Organization.objects.all()
+        else:
+            # Regular users see only their organization
+            queryset = Organization.objects.filter(id=context.organization_id)
+
+        # Member and environment counts for OrganizationSerializer, as
+        # correlated counts rather than joins so neither multiplies the other.
+        # Skipped when the client opts out of them
+        if includes_counts(self.request):
+            queryset = queryset.annotate(
+                _users_count=_organization_count(User.objects.all()),
+                _environments_count=_organization_count(Environment.objects.all()),
+            )
 
-        # Fallback: return empty queryset
-        return Organization.objects.none()
+        return queryset
 
     def perform_create(self, serializer):
         """Only admins can create organizations"""
-        if self.request.user.role != 'admin' and not self.request.user.is_superuser:
+        if not get_auth_context(self.request).is_admin:
             self.permission_denied(
                 self.request,
                 message="Only administrators can create organizations",
@@ -52,7 +110,7 @@ class OrganizationViewSet(viewsets.ModelViewSet):
 
     def perform_update(self, serializer):
         """Only admins can update organizations"""
-        if self.request.user.role != 'admin' and not self.request.user.is_superuser:
+        if not get_auth_context(self.request).is_admin:
             self.permission_denied(
                 self.request,
                 message="Only administrators can update organizations",
@@ -63,7 +121,7 @@ class OrganizationViewSet(viewsets.ModelViewSet):
 
     def perform_destroy(self, serializer):
         """Only admins can delete organizations"""
-        if self.request.user.role != 'admin' and not self.request.user.is_superuser:
+        if not get_auth_context(self.request).is_admin:
             self.permission_denied(
                 self.request,
                 message="Only administrators can delete organizations",
@@ -77,56 +135,55 @@ class OrganizationViewSet(viewsets.ModelViewSet):
         """Get organization statistics"""
         organization = self.get_object()
 
-        if not self._user_has_access(request.user, organization):
+        if not self._user_has_access(organization):
             return Response(
                 {'error': 'Access denied'},
                 status=status.HTTP_403_FORBIDDEN
             )
 
-        # Calculate stats (placeholder for now)
-        stats = {
-            'users_count': organization.users.count(),
-            'active_users_count': organization.users.filter(is_active=True).count(),
-            'environments_count': organization.environments.count(),
-            'active_environments_count': organization.environments.filter(is_active=True).count(),
-            'drift_events_count': organization.environments.filter(
-                drift_events__isnull=False
-            ).values('drift_events').count(),
-        }
+        # Cached under the organization's list version, which changes with
+        # its environments and drift events; member changes show once the
+        # entry expires. Computed directly when the cache is unavailable
+        version = get_list_version(organization.pk)
+        if version is None:
+            return Response(self._compute_stats(organization))
+
+        stats = cache.get_or_set(
+            f'org-stats:{organization.pk}:{version}',
+            lambda: self._compute_stats(organization),
+            timeout=ORGANIZATION_STATS_CACHE_TIMEOUT
+        )
 
         return Response(stats)
 
-    def _user_has_access(self, user, organization):
-        """Check if user has access to organization"""
-        if user.role == 'admin' or user.is_superuser:
-            return True
-
-        return hasattr(user, 'organization') and user.organization == organization
-
-    def _user_is_admin_for_organization(self, user, organization):
-        """Check if user is admin for the organization"""
-        if user.is_superuser:
-            return True
-
-        # Organization admin if they are admin role in that organization
-        return (user.role == 'admin' and
-                hasattr(user, 'organization') and
-                user.organization == organization)
+    @staticmethod
+    def _compute_stats(organization):
+        """All of an organization's statistics in one query"""
+        return Organization.objects.filter(pk=organization.pk).values(
+            users_count=_organization_count(User.objects.all()),
+            active_users_count=_organization_count(User.objects.filter(is_active=True)),
+            environments_count=_organization_count(Environment.objects.all()),
+            active_environments_count=_organization_count(Environment.objects.filter(is_active=True)),
+            drift_events_count=_organization_count(DriftEvent.objects.all(), 'environment__organization'),
+        ).get()
 
     @action(detail=True, methods=['get'])
     def members(self, request, pk=None):
         """List all members of the organization"""
         organization = self.get_object()
 
-        if not self._user_has_access(request.user, organization):
+        if not self._user_has_access(organization):
             return Response(
                 {'error': 'Access denied'},
                 status=status.HTTP_403_FORBIDDEN
             )
 
-        # Get all users in the organization
-        users = organization.users.all().order_by('username')
-        serializer = OrganizationMemberSerializer(users, many=True)
+        # Get all users in the organization; every member shares it, so the
+        # serializer reads its name from the context rather than per user
+        users = organization.users.order_by('username')
+        serializer = OrganizationMemberSerializer(
+            users, many=True, context={'organization': organization}
+        )
         return Response(serializer.data)
 
     @action(detail=True, methods=['post'])
@@ -134,7 +191,7 @@ class OrganizationViewSet(viewsets.ModelViewSet):
         """Invite a new user to join the organization"""
         organization = self.get_object()
 
-        if not self._user_is_admin_for_organization(request.user, organization):
+        if not self._user_is_admin_for_organization(organization):
             return Response(
                 {'error': 'Only organization administrators can invite members'},
                 status=status.HTTP_403_FORBIDDEN
@@ -190,15 +247,16 @@ class OrganizationViewSet(viewsets.ModelViewSet):
         """Update a member's role/status"""
         organization = self.get_object()
 
-        if not self._user_is_admin_for_organization(request.user, organization):
+        if not self._user_is_admin_for_organization(organization):
             return Response(
                 {'error': 'Only organization administrators can update members'},
                 status=status.HTTP_403_FORBIDDEN
             )
 
-        from apps.core.models import User
         try:
-            user = User.objects.get(id=user_id, organization=organization)
+            # Only the columns the member serializer and the checks below
+            # use; the organization is attached by the related manager
+            user = organization.users.only(*MEMBER_FIELDS).get(id=user_id)
         except User.DoesNotExist:
             return Response(
                 {'error': 'User not found in this organization'},
@@ -207,8 +265,8 @@ class OrganizationViewSet(viewsets.ModelViewSet):
 
         # Prevent changing the last admin's role
         if user.role == 'admin' and request.data.get('role') != 'admin':
-            admin_count = organization.users.filter(role='admin').count()
-            if admin_count <= 1:
+            has_other_admin = organization.users.filter(role='admin').exclude(pk=user.pk).exists()
+            if not has_other_admin:
                 return Response(
                     {'error': 'Cannot change role of the last organization administrator'},
                     status=status.HTTP_400_BAD_REQUEST
@@ -219,22 +277,23 @@ class OrganizationViewSet(viewsets.ModelViewSet):
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
         serializer.save()
-        return Response(OrganizationMemberSerializer(user).data)
+        return Response(OrganizationMemberSerializer(user, context={'organization': organization}).data)
 
     @action(detail=True, methods=['delete'], url_path=r'members/(?P<user_id>\d+)')
     def remove_member(self, request, pk=None, user_id=None):
         """Remove a member from the organization"""
         organization = self.get_object()
 
-        if not self._user_is_admin_for_organization(request.user, organization):
+        if not self._user_is_admin_for_organization(organization):
             return Response(
                 {'error': 'Only organization administrators can remove members'},
                 status=status.HTTP_403_FORBIDDEN
             )
 
-        from apps.core.models import User
         try:
-            user = User.objects.get(id=user_id, organization=organization)
+            # Only the columns the member serializer and the checks below
+            # use; the organization is attached by the related manager
+            user = organization.users.only(*MEMBER_FIELDS).get(id=user_id)
         except User.DoesNotExist:
             return Response(
                 {'error': 'User not found in this organization'},
@@ -243,8 +302,8 @@ class OrganizationViewSet(viewsets.ModelViewSet):
 
         # Prevent removing the last admin
         if user.role == 'admin':
-            admin_count = organization.users.filter(role='admin').count()
-            if admin_count <= 1:
+            has_other_admin = organization.users.filter(role='admin').exclude(pk=user.pk).exists()
+            if not has_other_admin:
                 return Response(
                     {'error': 'Cannot remove the last organization administrator'},
                     status=status.HTTP_400_BAD_REQUEST
@@ -261,7 +320,7 @@ class OrganizationViewSet(viewsets.ModelViewSet):
         return Response({'message': 'Member removed successfully'})
 
 
-class OrganizationSettingsView(APIView):
+class OrganizationSettingsView(OrganizationAccessMixin, APIView):
     """
     API view for organization settings management
     """
@@ -270,34 +329,32 @@ class OrganizationSettingsView(APIView):
 
     def get(self, request, pk):
         """Get organization settings"""
-        organization = get_object_or_404(Organization, pk=pk)
+        # The settings are joined in, so existing ones need no further query
+        organization = get_object_or_404(Organization.objects.select_related('settings'), pk=pk)
 
-        if not self._user_has_access(request.user, organization):
+        if not self._user_has_access(organization):
             return Response(
                 {'error': 'Access denied'},
                 status=status.HTTP_403_FORBIDDEN
             )
 
-        settings, created = OrganizationSettings.objects.get_or_create(
-            organization=organization
-        )
+        settings = self._get_settings(organization)
 
         serializer = OrganizationSettingsSerializer(settings)
         return Response(serializer.data)
 
     def put(self, request, pk):
         """Update organization settings"""
-        organization = get_object_or_404(Organization, pk=pk)
+        # The settings are joined in, so existing ones need no further query
+        organization = get_object_or_404(Organization.objects.select_related('settings'), pk=pk)
 
-        if not self._user_is_admin_for_organization(request.user, organization):
+        if not self._user_is_admin_for_organization(organization):
             return Response(
                 {'error': 'Only organization admins can update settings'},
                 status=status.HTTP_403_FORBIDDEN
             )
 
-        settings, created = OrganizationSettings.objects.get_or_create(
-            organization=organization
-        )
+        settings = self._get_settings(organization)
 
         serializer = OrganizationSettingsSerializer(settings, data=request.data)
         if serializer.is_valid():
@@ -306,166 +363,11 @@ class OrganizationSettingsView(APIView):
 
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-    def _user_has_access(self, user, organization):
-        """Check if user has access to organization"""
-        if user.role == 'admin' or user.is_superuser:
-            return True
-
-        return hasattr(user, 'organization') and user.organization == organization
-
-    def _user_is_admin_for_organization(self, user, organization):
-        """Check if user is admin for the organization"""
-        if user.is_superuser:
-            return True
-
-        # Organization admin if they are admin role in that organization
-        return (user.role == 'admin' and
-                hasattr(user, 'organization') and
-                user.organization == organization)
-
-    @action(detail=True, methods=['get'])
-    def members(self, request, pk=None):
-        """List all members of the organization"""
-        organization = self.get_object()
-
-        if not self._user_has_access(request.user, organization):
-            return Response(
-                {'error': 'Access denied'},
-                status=status.HTTP_403_FORBIDDEN
-            )
-
-        # Get all users in the organization
-        users = organization.users.all().order_by('username')
-        serializer = OrganizationMemberSerializer(users, many=True)
-        return Response(serializer.data)
-
-    @action(detail=True, methods=['post'])
-    def invite_member(self, request, pk=None):
-        """Invite a new user to join the organization"""
-        organization = self.get_object()
-
-        if not self._user_is_admin_for_organization(request.user, organization):
-            return Response(
-                {'error': 'Only organization administrators can invite members'},
-                status=status.HTTP_403_FORBIDDEN
-            )
-
-        serializer = OrganizationMemberInviteSerializer(
-            data=request.data,
-            context={'organization': organization}
-        )
-
-        if not serializer.is_valid():
-            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-
-        # For now, create the user directly (in production, you'd send an email invitation)
-        # Generate a temporary password or use a proper invitation flow
-        from django.contrib.auth.hashers import make_password
-        from django.utils.crypto import get_random_string
-
-        # Create user with temporary password
-        temp_password = get_random_string(length=12)
-        user_data = {
-            'username': serializer.validated_data['email'].split('@')[0],  # Simple username generation
-            'email': serializer.validated_data['email'],
-            'first_name': serializer.validated_data.get('first_name', ''),
-            'last_name': serializer.validated_data.get('last_name', ''),
-            'password': make_password(temp_password),
-            'organization': organization,
-            'role': serializer.validated_data['role'],
-            'is_active': True
-        }
-
-        # Create the user
-        from apps.core.models import User
-        try:
-            user = User.objects.create(**user_data)
-
-            # In production: Send invitation email with temp password or activation link
-            # For now, return the user data and note about temp password
-            response_data = OrganizationMemberSerializer(user).data
-            response_data['_temp_password'] = temp_password  # Remove this in production!
-            response_data['note'] = 'User created with temporary password. In production, send invitation email.'
-
-            return Response(response_data, status=status.HTTP_201_CREATED)
-
-        except Exception as e:
-            return Response(
-                {'error': f'Failed to create user: {str(e)}'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-
-    @action(detail=True, methods=['put'], url_path=r'members/(?P<user_id>\d+)')
-    def update_member(self, request, pk=None, user_id=None):
-        """Update a member's role/status"""
-        organization = self.get_object()
-
-        if not self._user_is_admin_for_organization(request.user, organization):
-            return Response(
-                {'error': 'Only organization administrators can update members'},
-                status=status.HTTP_403_FORBIDDEN
-            )
-
-        from apps.core.models import User
-        try:
-            user = User.objects.get(id=user_id, organization=organization)
-        except User.DoesNotExist:
-            return Response(
-                {'error': 'User not found in this organization'},
-                status=status.HTTP_404_NOT_FOUND
-            )
-
-        # Prevent changing the last admin's role
-        if user.role == 'admin' and request.data.get('role') != 'admin':
-            admin_count = organization.users.filter(role='admin').count()
-            if admin_count <= 1:
-                return Response(
-                    {'error': 'Cannot change role of the last organization administrator'},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-
-        serializer = OrganizationMemberUpdateSerializer(user, data=request.data, partial=True)
-        if not serializer.is_valid():
-            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-
-        serializer.save()
-        return Response(OrganizationMemberSerializer(user).data)
-
-    @action(detail=True, methods=['delete'], url_path=r'members/(?P<user_id>\d+)')
-    def remove_member(self, request, pk=None, user_id=None):
-        """Remove a member from the organization"""
-        organization = self.get_object()
-
-        if not self._user_is_admin_for_organization(request.user, organization):
-            return Response(
-                {'error': 'Only organization administrators can remove members'},
-                status=status.HTTP_403_FORBIDDEN
-            )
-
-        from apps.core.models import User
+    def _get_settings(self, organization):
+        """The organization's settings, created with defaults on first use"""
         try:
-            user = User.objects.get(id=user_id, organization=organization)
-        except User.DoesNotExist:
-            return Response(
-                {'error': 'User not found in this organization'},
-                status=status.HTTP_404_NOT_FOUND
-            )
-
-        # Prevent removing the last admin
-        if user.role == 'admin':
-            admin_count = organization.users.filter(role='admin').count()
-            if admin_count <= 1:
-                return Response(
-                    {'error': 'Cannot remove the last organization administrator'},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-
-        # Prevent users from removing themselves
-        if user.id == request.user.id:
-            return Response(
-                {'error': 'You cannot remove yourself from the organization'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-
-        user.delete()
-        return Response({'message': 'Member removed successfully'})
+            return organization.settings
+        except OrganizationSettings.DoesNotExist:
+            # get_or_create, so a concurrent first request creating them
+            # too is not an IntegrityError
+            return OrganizationSettings.objects.get_or_create(organization=organization)[0]
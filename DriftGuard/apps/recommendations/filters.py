@@ -0,0 +1,19 @@
+"""
+Filter sets for the recommendation viewsets
+"""
+
+import django_filters
+
+from .models import RecommendationFeedback
+
+
+class RecommendationFeedbackFilter(django_filters.FilterSet):
+    """Feedback filters, with user_id compared as a plain column"""
+
+    # The generated filter for the user foreign key would load the user to
+    # validate the choice
+    user_id = django_filters.NumberFilter(field_name='user_id')
+
+    class Meta:
+        model = RecommendationFeedback
+        fields = ['feedback_type', 'user_id']
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-15 18:20
+
+from django.db import migrations, models
+
+from apps.core.operations import AddIndexConcurrentlyIfPostgres, RemoveIndexConcurrentlyIfPostgres
+
+
+class Migration(migrations.Migration):
+
+    # CREATE/DROP INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('drifts', '0004_driftevent_tags_gin'),
+        ('recommendations', '0001_initial'),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyIfPostgres(
+            model_name='recommendation',
+            index=models.Index(fields=['is_implemented', 'is_expired', '-created_at'], name='rec_active_recent_idx'),
+        ),
+        AddIndexConcurrentlyIfPostgres(
+            model_name='recommendation',
+            index=models.Index(fields=['drift_event', '-confidence_score'], name='rec_event_conf_idx'),
+        ),
+        # Replaced by rec_active_recent_idx, which leads with is_implemented
+        RemoveIndexConcurrentlyIfPostgres(
+            model_name='recommendation',
+            name='recommendat_is_impl_5b384e_idx',
+        ),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 5.2.18 on 2026-10-15 18:24
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def clear_unknown_users(apps, schema_editor):
+    """Feedback from users that no longer exist cannot reference them"""
+    RecommendationFeedback = apps.get_model('recommendations', 'RecommendationFeedback')
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+    RecommendationFeedback.objects.exclude(
+        user__isnull=True
+    ).exclude(
+        user_id__in=User.objects.values('pk')
+    ).update(user=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recommendations', '0002_active_recent_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        # The user_id column is kept as the foreign key's column; it is made
+        # nullable and widened to bigint to match the BigAutoField user pk
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.AlterField(
+                    model_name='recommendationfeedback',
+                    name='user_id',
+                    field=models.BigIntegerField(null=True, help_text='User who provided feedback'),
+                ),
+            ],
+            state_operations=[
+                migrations.RemoveField(
+                    model_name='recommendationfeedback',
+                    name='user_id',
+                ),
+                migrations.AddField(
+                    model_name='recommendationfeedback',
+                    name='user',
+                    field=models.ForeignKey(
+                        db_constraint=False, db_index=False, help_text='User who provided feedback', null=True,
+                        on_delete=django.db.models.deletion.SET_NULL, related_name='recommendation_feedback',
+                        to=settings.AUTH_USER_MODEL
+                    ),
+                ),
+            ],
+        ),
+        migrations.RunPython(clear_unknown_users, migrations.RunPython.noop),
+        # Adds the index and the foreign key constraint
+        migrations.AlterField(
+            model_name='recommendationfeedback',
+            name='user',
+            field=models.ForeignKey(
+                help_text='User who provided feedback', null=True,
+                on_delete=django.db.models.deletion.SET_NULL, related_name='recommendation_feedback',
+                to=settings.AUTH_USER_MODEL
+            ),
+        ),
+    ]
@@ -1,7 +1,21 @@
 from django.db import models
+from django.contrib.auth import get_user_model
+from django.db.models import Case, FloatField, Value, When
+from django.db.models.functions import Cast
 from django.core.validators import MaxValueValidator, MinValueValidator
 from apps.drifts.models import DriftEvent
 
+User = get_user_model()
+
+
+# Weight of each priority in the urgency score, out of 4
+_PRIORITY_WEIGHTS = {
+    'low': 1,
+    'medium': 2,
+    'high': 3,
+    'critical': 4,
+}
+
 
 class Recommendation(models.Model):
     """AI-generated remediation suggestions for drift events"""
@@ -137,7 +151,11 @@ class Recommendation(models.Model):
             models.Index(fields=['recommendation_type', 'priority']),
             models.Index(fields=['confidence_score']),
             models.Index(fields=['expires_at']),
-            models.Index(fields=['is_implemented']),
+            # Open recommendations, newest first (the list's flag filters and
+            # cursor order); also covers is_implemented alone
+            models.Index(fields=['is_implemented', 'is_expired', '-created_at'], name='rec_active_recent_idx'),
+            # A drift event's recommendations in the default ordering
+            models.Index(fields=['drift_event', '-confidence_score'], name='rec_event_conf_idx'),
         ]
 
     def __str__(self):
@@ -150,16 +168,21 @@ class Recommendation(models.Model):
     def mark_implemented(self, result=None):
         """Mark this recommendation as implemented"""
         from django.utils import timezone
+
         self.implemented_at = timezone.now()
         self.is_implemented = True
+        update_fields = ['implemented_at', 'is_implemented']
         if result:
             self.implementation_result = result
-        self.save()
+            update_fields.append('implementation_result')
+        # Write just the changed columns rather than the rationale and JSON
+        # details back unchanged
+        self.save(update_fields=update_fields)
 
     def cancel(self):
         """Cancel this recommendation"""
         self.is_expired = True
-        self.save()
+        self.save(update_fields=['is_expired'])
 
     @property
     def implementation_status(self):
@@ -176,25 +199,30 @@ class Recommendation(models.Model):
         if not self.implementation_steps:
             return ""
 
-        steps = []
-        for i, step in enumerate(self.implementation_steps, 1):
-            step_text = step.get('description', '') if isinstance(step, dict) else str(step)
-            steps.append(f"{i}. {step_text}")
-
-        return "\n".join(steps)
+        return "\n".join(
+            f"{i}. {step.get('description', '') if isinstance(step, dict) else step}"
+            for i, step in enumerate(self.implementation_steps, 1)
+        )
 
     @property
     def urgency_score(self):
         """Calculate urgency score based on priority and confidence"""
-        priority_weights = {
-            'low': 1,
-            'medium': 2,
-            'high': 3,
-            'critical': 4,
-        }
-        priority_score = priority_weights.get(self.priority, 2)
+        # Annotated by RecommendationViewSet for lists
+        if hasattr(self, '_urgency_score'):
+            return self._urgency_score
+
+        priority_score = _PRIORITY_WEIGHTS.get(self.priority, 2)
         return (priority_score / 4.0) * float(self.confidence_score)
 
+    @staticmethod
+    def urgency_score_expression():
+        """urgency_score computed by the database"""
+        return Case(
+            *(When(priority=priority, then=Value(weight / 4.0)) for priority, weight in _PRIORITY_WEIGHTS.items()),
+            default=Value(2 / 4.0),
+            output_field=FloatField()
+        ) * Cast('confidence_score', FloatField())
+
 
 class RecommendationTemplate(models.Model):
     """Templates for common recommendations"""
@@ -295,7 +323,13 @@ class RecommendationFeedback(models.Model):
     )
 
     # Context
-    user_id = models.IntegerField(help_text='User who provided feedback')
+    user = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='recommendation_feedback',
+        help_text='User who provided feedback'
+    )
     user_role = models.CharField(
         max_length=50,
         blank=True,
@@ -6,10 +6,8 @@ from .models import Recommendation, RecommendationTemplate, RecommendationFeedba
 class RecommendationSerializer(serializers.ModelSerializer):
     """Serializer for Recommendation"""
 
-    drift_event_id = serializers.CharField(
-        source='drift_event.id',
-        read_only=True
-    )
+    # The foreign key column, so the drift event itself is never loaded
+    drift_event_id = serializers.CharField(read_only=True)
     implementation_status = serializers.SerializerMethodField(read_only=True)
     urgency_score = serializers.SerializerMethodField(read_only=True)
 
@@ -33,6 +31,16 @@ class RecommendationSerializer(serializers.ModelSerializer):
         return obj.urgency_score
 
 
+class RecommendationListSerializer(RecommendationSerializer):
+    """Recommendation list entries, without the rationale and the larger JSON details"""
+
+    class Meta(RecommendationSerializer.Meta):
+        fields = [
+            name for name in RecommendationSerializer.Meta.fields
+            if name not in ('rationale', 'risk_assessment', 'recommended_by_details', 'implementation_result')
+        ]
+
+
 class RecommendationTemplateSerializer(serializers.ModelSerializer):
     """Serializer for RecommendationTemplate"""
 
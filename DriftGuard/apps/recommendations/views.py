@@ -1,33 +1,55 @@
+from django_auto_prefetching import AutoPrefetchViewSetMixin
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
+from apps.core.filters import SkipUnusedFiltersMixin
+from apps.core.middleware import get_auth_context
+from apps.core.mixins import ListOmittedFieldsMixin
 from apps.core.permissions import RoleBasedPermission
+from .filters import RecommendationFeedbackFilter
 from .models import Recommendation, RecommendationTemplate, RecommendationFeedback
-from .serializers import RecommendationSerializer, RecommendationTemplateSerializer, RecommendationFeedbackSerializer
+from .serializers import (
+    RecommendationSerializer,
+    RecommendationListSerializer,
+    RecommendationTemplateSerializer,
+    RecommendationFeedbackSerializer
+)
 
 
-class RecommendationViewSet(viewsets.ModelViewSet):
+class RecommendationViewSet(ListOmittedFieldsMixin, SkipUnusedFiltersMixin, AutoPrefetchViewSetMixin, viewsets.ModelViewSet):
     """
     ViewSet for recommendation management
     """
 
     serializer_class = RecommendationSerializer
+    list_serializer_class = RecommendationListSerializer
+    # Rendered as its id, which the foreign key column already holds
+    auto_prefetch_excluded_fields = {'drift_event'}
     permission_classes = [RoleBasedPermission]
     filterset_fields = ['recommendation_type', 'priority', 'is_implemented', 'is_expired']
     ordering_fields = ['-confidence_score', '-created_at']
     ordering = ['-created_at']
 
-    def get_queryset(self):
+    def get_prefetchable_queryset(self):
         """Filter recommendations based on user's organization drifts"""
+        # Relations rendered by the serializer are added by
+        # AutoPrefetchViewSetMixin; the organization is matched by id
+        # rather than loaded
         user = self.request.user
         if user.role == 'admin' or user.is_superuser:
-            return Recommendation.objects.all().select_related('drift_event')
+            queryset = Recommendation.objects.all()
         else:
-            return Recommendation.objects.filter(
-                drift_event__environment__organization=user.organization,
+            queryset = Recommendation.objects.filter(
+                drift_event__environment__organization_id=get_auth_context(self.request).organization_id,
                 drift_event__environment__is_active=True
-            ).select_related('drift_event')
+            )
+        if self.action == 'list':
+            # Only for lists: the other actions may change priority or
+            # confidence before serializing, which would leave the
+            # annotation stale
+            queryset = queryset.annotate(_urgency_score=Recommendation.urgency_score_expression())
+        return queryset
 
     @action(detail=True, methods=['post'], permission_classes=[RoleBasedPermission])
     def implement(self, request, pk=None):
@@ -39,7 +61,7 @@ class RecommendationViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class RecommendationTemplateViewSet(viewsets.ModelViewSet):
+class RecommendationTemplateViewSet(SkipUnusedFiltersMixin, viewsets.ModelViewSet):
     """
     ViewSet for recommendation template management (admin only)
     """
@@ -59,26 +81,28 @@ class RecommendationTemplateViewSet(viewsets.ModelViewSet):
             return RecommendationTemplate.objects.filter(is_active=True)
 
 
-class RecommendationFeedbackViewSet(viewsets.ModelViewSet):
+class RecommendationFeedbackViewSet(SkipUnusedFiltersMixin, AutoPrefetchViewSetMixin, viewsets.ModelViewSet):
     """
     ViewSet for recommendation feedback
     """
 
     serializer_class = RecommendationFeedbackSerializer
     permission_classes = [RoleBasedPermission]
-    filterset_fields = ['feedback_type', 'user_id']
+    filterset_class = RecommendationFeedbackFilter
     ordering = ['-created_at']
 
-    def get_queryset(self):
+    def get_prefetchable_queryset(self):
         """Filter feedback based on user's organization recommendations"""
+        # The recommendation (for its title) is joined by
+        # AutoPrefetchViewSetMixin
         user = self.request.user
         if user.role == 'admin' or user.is_superuser:
-            return RecommendationFeedback.objects.all().select_related('recommendation', 'recommendation__drift_event')
+            return RecommendationFeedback.objects.all()
         else:
             return RecommendationFeedback.objects.filter(
-                recommendation__drift_event__environment__organization=user.organization,
+                recommendation__drift_event__environment__organization_id=get_auth_context(self.request).organization_id,
                 recommendation__drift_event__environment__is_active=True
-            ).select_related('recommendation', 'recommendation__drift_event')
+            )
 
     def perform_create(self, serializer):
         """Set user_id and role automatically"""
@@ -0,0 +1,16 @@
+"""
+Celery application for driftguard project.
+
+Reads CELERY_* options from Django settings and discovers tasks in every
+installed app.
+"""
+
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'driftguard.settings')
+
+app = Celery('driftguard')
+app.config_from_object('django.conf:settings', namespace='CELERY')
+app.autodiscover_tasks()
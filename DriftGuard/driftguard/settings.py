@@ -6,8 +6,12 @@ Enhanced with comprehensive configuration for DriftGuard MVP.
 """
 
 import os
+from datetime import timedelta
 from pathlib import Path
 
+from celery.schedules import crontab
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -59,6 +63,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'apps.core.middleware.AuthContextMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'django_prometheus.middleware.PrometheusAfterMiddleware',
@@ -154,13 +159,12 @@ REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'apps.core.pagination.DefaultCursorPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'apps.core.renderers.OrjsonRenderer',
         'rest_framework.renderers.BrowsableAPIRenderer',
     ],
 }
 
 # JWT Settings
-from datetime import timedelta
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=1),
@@ -181,6 +185,18 @@ SIMPLE_JWT = {
     'JTI_CLAIM': 'jti',
 }
 
+# Key for cloud credential secrets stored with EncryptedTextField; changing
+# it makes existing secrets unreadable. Kept separate from SECRET_KEY so that
+# rotating SECRET_KEY does not lose the stored credentials
+CREDENTIALS_ENCRYPTION_KEY = os.environ.get('CREDENTIALS_ENCRYPTION_KEY', '')
+if not CREDENTIALS_ENCRYPTION_KEY:
+    if not DEBUG:
+        raise ImproperlyConfigured('CREDENTIALS_ENCRYPTION_KEY must be set when DEBUG is off')
+    CREDENTIALS_ENCRYPTION_KEY = 'django-insecure-development-credentials-key'
+
+# Bulk write configuration (rows per INSERT statement for bulk_create)
+DRIFTGUARD_BULK_BATCH_SIZE = int(os.environ.get('DRIFTGUARD_BULK_BATCH_SIZE', 1000))
+
 # Celery Configuration
 CELERY_BROKER_URL = os.environ.get('REDIS_URL', 'redis://localhost:6379/0')
 CELERY_RESULT_BACKEND = os.environ.get('REDIS_URL', 'redis://localhost:6379/0')
@@ -189,6 +205,26 @@ CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
 
+CELERY_BEAT_SCHEDULE = {
+    # Idempotent; runs daily so a missed run never leaves the next month
+    # without an audit log partition
+    'create-audit-log-partitions': {
+        'task': 'apps.core.tasks.create_audit_log_partitions',
+        'schedule': crontab(hour=0, minute=30),
+    },
+    'archive-cold-audit-logs': {
+        'task': 'apps.core.tasks.archive_cold_audit_logs',
+        'schedule': crontab(hour=2, minute=0),
+    },
+    'deactivate-expired-sessions': {
+        'task': 'apps.core.tasks.deactivate_expired_sessions',
+        'schedule': crontab(minute='*/15'),
+    },
+}
+
+# Audit log entries older than this are moved to compressed archive storage
+AUDIT_LOG_ARCHIVE_AFTER_DAYS = int(os.environ.get('AUDIT_LOG_ARCHIVE_AFTER_DAYS', 90))
+
 # Cache Configuration
 CACHES = {
     'default': {
@@ -14,17 +14,53 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+import hashlib
+import json
+
 from django.contrib import admin
 from django.urls import path, include
-from django.http import JsonResponse
+from django.http import HttpResponse
 from django.conf import settings
 from django.conf.urls.static import static
+from django.core.cache import cache
+from django.db import DatabaseError, connection
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control, quote_etag
+from django.views import View
 from django.views.decorators.cache import never_cache
 
-@never_cache
-def api_v1_root(request):
+def _json_body(data):
+    """Encode a constant JSON payload, once at import rather than per request"""
+    return json.dumps(data, separators=(',', ':')).encode()
+
+
+class StaticJSONView(View):
+    """
+    Serves a constant JSON payload
+
+    Subclasses set data; its body and ETag are built once, when the class is
+    defined, and matching If-None-Match requests get a 304.
+    """
+
+    data = {}
+    max_age = 300
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.body = _json_body(cls.data)
+        cls.etag = quote_etag(hashlib.md5(cls.body).hexdigest())
+
+    def get(self, request, *args, **kwargs):
+        response = HttpResponse(self.body, content_type='application/json')
+        response['ETag'] = self.etag
+        patch_cache_control(response, public=True, max_age=self.max_age)
+        return get_conditional_response(request, etag=self.etag, response=response)
+
+
+class ApiV1RootView(StaticJSONView):
     """API v1 root endpoint showing available resources"""
-    return JsonResponse({
+
+    data = {
         'message': 'DriftGuard API v1',
         'version': 'v1.0.0',
         'endpoints': {
@@ -38,11 +74,12 @@ def api_v1_root(request):
         },
         'authentication': 'JWT Bearer token required',
         'documentation': 'See architecture documentation for detailed API specification'
-    })
+    }
+
 
 # API URL patterns - v1 API routes
 api_patterns = [
-    path('', api_v1_root, name='api_v1_root'),
+    path('', ApiV1RootView.as_view(), name='api_v1_root'),
     path('auth/', include('apps.core.urls')),
     path('organizations/', include('apps.organizations.urls')),
     path('environments/', include('apps.environments.urls')),
@@ -56,10 +93,11 @@ api_patterns = [
     # path('analytics/', include('apps.analytics.urls')),
 ]
 
-@never_cache
-def root_view(request):
+
+class RootView(StaticJSONView):
     """Simple root view for API information"""
-    return JsonResponse({
+
+    data = {
         'message': 'DriftGuard AI-Powered Infrastructure Drift Detection API',
         'version': 'v1.0.0',
         'status': 'active',
@@ -70,27 +108,66 @@ def root_view(request):
             'admin': '/admin/'
         },
         'documentation': 'See architecture documentation for full API specification'
-    })
+    }
 
-@never_cache
-def health_check(request):
-    """Simple health check endpoint"""
-    return JsonResponse({
-        'status': 'healthy',
-        'timestamp': '2025-01-01T12:00:00Z',
+
+# Probes arriving within this many seconds share one database check
+HEALTH_CACHE_KEY = 'health:v1'
+HEALTH_CACHE_TIMEOUT = 2
+
+
+def _check_health(cache_available):
+    """Probe the database and return the (status code, body) to serve"""
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        database = 'connected'
+    except DatabaseError:
+        database = 'unavailable'
+
+    if database != 'connected':
+        status = 'unhealthy'
+    elif not cache_available:
+        status = 'degraded'
+    else:
+        status = 'healthy'
+
+    body = _json_body({
+        'status': status,
+        'timestamp': timezone.now().isoformat(),
         'services': {
-            'database': 'connected',
-            'cache': 'available',
+            'database': database,
+            'cache': 'available' if cache_available else 'unavailable',
             'app': 'running'
         }
     })
+    return (503 if status == 'unhealthy' else 200), body
+
+
+@never_cache
+def health_check(request):
+    """Health check endpoint, reporting database and cache availability"""
+    try:
+        result = cache.get(HEALTH_CACHE_KEY)
+        cache_available = True
+    except Exception:
+        result = None
+        cache_available = False
+
+    if result is None:
+        result = _check_health(cache_available)
+        if cache_available:
+            cache.set(HEALTH_CACHE_KEY, result, HEALTH_CACHE_TIMEOUT)
+
+    status, body = result
+    return HttpResponse(body, status=status, content_type='application/json')
 
 urlpatterns = [
     # Admin interface
     path('admin/', admin.site.urls),
 
     # Root API information
-    path('', root_view, name='root'),
+    path('', RootView.as_view(), name='root'),
 
     # Health check
     path('health/', health_check, name='health'),
@@ -101,14 +178,8 @@ urlpatterns = [
     # Web dashboard (HTML views)
     # path('dashboard/', include('apps.dashboard.urls')),  # TODO: Uncomment when dashboard app is created
 
-] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+]
 
-# Development-only URLs (debug toolbar, etc.)
+# Development-only URLs (media files)
 if settings.DEBUG:
-    try:
-        import debug_toolbar
-        urlpatterns = [
-            path('__debug__/', include(debug_toolbar.urls)),
-        ] + urlpatterns
-    except ImportError:
-        pass
+    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
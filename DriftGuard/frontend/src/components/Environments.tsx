@@ -535,7 +535,7 @@ const Environments: React.FC = () => {
               <TableCell>Provider</TableCell>
               <TableCell>Region</TableCell>
               <TableCell>Status</TableCell>
-              <TableCell>Resources</TableCell>
+              <TableCell>Org Resources</TableCell>
               <TableCell>Credentials</TableCell>
               <TableCell>Actions</TableCell>
             </TableRow>
@@ -555,7 +555,7 @@ const Environments: React.FC = () => {
                     size="small"
                   />
                 </TableCell>
-                <TableCell>{env.resource_count}</TableCell>
+                <TableCell>{env.organization_resource_count}</TableCell>
                 <TableCell>
                   {env.has_credentials ? (
                     <CheckCircleIcon color="success" />
@@ -11,7 +11,7 @@ export interface Environment {
   tags: string[];
   is_active: boolean;
   is_ready_for_scan: boolean;
-  resource_count: number;
+  organization_resource_count: number;
   drift_count: number;
   has_credentials: boolean;
   created_at: string;